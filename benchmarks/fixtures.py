@@ -0,0 +1,148 @@
+"""
+Offline replay of the recorded fixtures.
+
+`offline()` patches nfl_data_py and espn_api's `League` class so every hot
+path in the app runs against the files in benchmarks/fixtures/ instead of
+the network. The replacements are autospecced against the real functions,
+so a call the real API would reject fails the benchmark instead of being
+timed as if it worked.
+"""
+import json
+import os
+import shutil
+import tempfile
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+
+from benchmarks.record_fixtures import ROOT, NFL_DIR, LEAGUE_FILE
+
+FIXTURE_SEASON = 2025
+# Served from the same payload, to exercise the /leagues/{id}/{year} routes
+SECOND_LEAGUE_ID = 654321
+
+
+@lru_cache(maxsize=None)
+def _read_frame(name):
+    return pd.read_csv(NFL_DIR / f"{name}.csv.gz")
+
+
+def load_frame(name):
+    """Return a fresh copy, as nfl_data_py does for every import_* call."""
+    return _read_frame(name).copy()
+
+
+@lru_cache(maxsize=None)
+def load_league_payload():
+    return json.loads(LEAGUE_FILE.read_text())
+
+
+# ---------------------------------------------------------------------------
+# nfl_data_py replacements
+# ---------------------------------------------------------------------------
+
+def import_weekly_data(years, columns=None, downcast=True, thread_requests=False):
+    df = pd.concat([load_frame(f"weekly_{y}") for y in years], ignore_index=True)
+    return df[columns] if columns else df
+
+
+def import_seasonal_data(years, s_type="REG"):
+    return pd.concat([load_frame(f"seasonal_{y}") for y in years], ignore_index=True)
+
+
+def import_schedules(years):
+    return pd.concat([load_frame(f"schedules_{y}") for y in years], ignore_index=True)
+
+
+def import_ids(columns=None, ids=None):
+    return pd.DataFrame(columns=["nfl_id", "gsis_id", "fantasy_data_id", "position"])
+
+
+# ---------------------------------------------------------------------------
+# espn_api replacement
+# ---------------------------------------------------------------------------
+
+class FixtureLeague:
+    """Mimics the parts of espn_api.football.League the app touches."""
+
+    def __init__(self, league_id, year, espn_s2=None, swid=None, fetch_league=True, debug=False):
+        payload = load_league_payload()
+        self.league_id = league_id or payload["league_id"]
+        self.year = year or payload["year"]
+        self.current_week = payload["current_week"]
+        self.settings = SimpleNamespace(**payload["settings"])
+        self.teams = []
+        by_id = {}
+        for t in payload["teams"]:
+            team = SimpleNamespace(**{k: v for k, v in t.items() if k not in ("roster", "schedule")})
+            team.roster = [SimpleNamespace(**p) for p in t["roster"]]
+            by_id[team.team_id] = team
+            self.teams.append(team)
+        for team, t in zip(self.teams, payload["teams"]):
+            team.schedule = [by_id[opp] for opp in t["schedule"]]
+        self._free_agents = [SimpleNamespace(**p) for p in payload["free_agents"]]
+
+    def scoreboard(self, week=None):
+        week = week or self.current_week
+        seen = set()
+        matchups = []
+        for team in self.teams:
+            opp = team.schedule[week - 1]
+            if opp.team_id in seen:
+                continue
+            seen.add(team.team_id)
+            matchups.append(SimpleNamespace(
+                home_team=team, away_team=opp,
+                home_score=team.scores[week - 1], away_score=opp.scores[week - 1],
+            ))
+        return matchups
+
+    def free_agents(self, week=None, size=50, position=None, position_id=None):
+        players = self._free_agents
+        if position:
+            players = [p for p in players if p.position == position]
+        return players[:size]
+
+
+# ---------------------------------------------------------------------------
+# Patch context
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def offline():
+    """Run the app's hot paths against recorded fixtures."""
+    os.environ.setdefault("ESPN_LEAGUE_ID", str(load_league_payload()["league_id"]))
+    os.environ.setdefault("ESPN_YEAR", str(FIXTURE_SEASON))
+    os.environ.setdefault("ESPN_LEAGUES", f"{SECOND_LEAGUE_ID}:{FIXTURE_SEASON}")
+    history_dir = Path(tempfile.mkdtemp(prefix="bench-history-"))
+    os.environ["HISTORY_DIR"] = str(history_dir)
+
+    import nfl_data_py
+    import espn_api.football
+    import datamanager
+    import history
+    import nfl_data
+    import scraper
+    import tools
+
+    with ExitStack() as stack:
+        for name, fn in (
+            ("import_weekly_data", import_weekly_data),
+            ("import_seasonal_data", import_seasonal_data),
+            ("import_schedules", import_schedules),
+            ("import_ids", import_ids),
+        ):
+            stack.enter_context(mock.patch.object(nfl_data_py, name, autospec=True, side_effect=fn))
+        stack.enter_context(mock.patch.object(
+            espn_api.football, "League", autospec=True, side_effect=FixtureLeague
+        ))
+        for module in (tools, datamanager, history, nfl_data, scraper):
+            stack.enter_context(mock.patch.object(module, "get_season", lambda: FIXTURE_SEASON))
+        try:
+            yield SimpleNamespace(csv_dir=ROOT / "data", season=FIXTURE_SEASON)
+        finally:
+            shutil.rmtree(history_dir, ignore_errors=True)
@@ -0,0 +1,277 @@
+"""
+Record the offline fixtures used by the benchmark suite.
+
+Two modes:
+- live: snapshot the configured ESPN league (.env credentials) and the
+  nfl_data_py frames the app reads, trimmed to the columns we use.
+- synthetic: build deterministic fixtures with the same schemas from the
+  players in data/ftn_airyards_2025_all.csv (no network needed).
+
+Usage:
+    python -m benchmarks.record_fixtures --synthetic
+    python -m benchmarks.record_fixtures --live --season 2025
+"""
+import argparse
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tools import RELEVANT_COLUMNS, NFL_SEASON_WEEKS, TEAM_ABBREVIATIONS
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+NFL_DIR = FIXTURE_DIR / "nfl"
+LEAGUE_FILE = FIXTURE_DIR / "espn_league.json"
+
+WEEKLY_COLUMNS = [
+    "player_display_name", "position", "recent_team", "opponent_team", "season", "week",
+    "carries", "rushing_yards", "rushing_tds", "receptions", "targets",
+    "receiving_yards", "receiving_tds",
+]
+SCHEDULE_COLUMNS = ["season", "game_type", "week", "home_team", "away_team"]
+NFL_TEAMS = sorted(
+    abbr for abbr in TEAM_ABBREVIATIONS if abbr not in ("LAR", "OAK", "SD", "STL")
+)
+
+
+def save_frame(df, name):
+    NFL_DIR.mkdir(parents=True, exist_ok=True)
+    path = NFL_DIR / f"{name}.csv.gz"
+    # Fixed gzip mtime so re-recording identical data leaves the file unchanged
+    df.to_csv(path, index=False, compression={"method": "gzip", "mtime": 0})
+    logger.info(f"Wrote {path} ({len(df)} rows)")
+
+
+def save_league(payload):
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    LEAGUE_FILE.write_text(json.dumps(payload, indent=1))
+    logger.info(f"Wrote {LEAGUE_FILE}")
+
+
+# ---------------------------------------------------------------------------
+# Live recording
+# ---------------------------------------------------------------------------
+
+def _player_payload(p):
+    return {
+        "name": p.name,
+        "playerId": getattr(p, "playerId", None),
+        "position": p.position,
+        "proTeam": p.proTeam,
+        "projected_total_points": getattr(p, "projected_total_points", None),
+        "projected_avg_points": getattr(p, "projected_avg_points", None),
+        "avg_points": getattr(p, "avg_points", None),
+    }
+
+
+def record_league():
+    """Snapshot the attributes of the configured ESPN league the app reads."""
+    from espn_client import default_league, get_league
+
+    league = get_league(default_league())
+    teams = []
+    for t in league.teams:
+        teams.append({
+            "team_id": t.team_id,
+            "team_name": t.team_name,
+            "team_abbrev": t.team_abbrev,
+            "owner": str(getattr(t, "owner", None) or getattr(t, "owners", "")),
+            "wins": t.wins,
+            "losses": t.losses,
+            "points_for": t.points_for,
+            "points_against": t.points_against,
+            "schedule": [opp.team_id for opp in t.schedule],
+            "scores": list(t.scores),
+            "roster": [_player_payload(p) for p in t.roster],
+        })
+    return {
+        "league_id": league.league_id,
+        "year": league.year,
+        "current_week": league.current_week,
+        "settings": {
+            "name": league.settings.name,
+            "reg_season_count": league.settings.reg_season_count,
+            "playoff_team_count": league.settings.playoff_team_count,
+        },
+        "teams": teams,
+        "free_agents": [_player_payload(p) for p in league.free_agents(size=200)],
+    }
+
+
+def record_live(season):
+    import nfl_data_py as nfl
+
+    for year in (season, season - 1):
+        weekly = nfl.import_weekly_data([year])
+        save_frame(weekly[[c for c in WEEKLY_COLUMNS if c in weekly.columns]], f"weekly_{year}")
+        seasonal = nfl.import_seasonal_data([year], "REG")
+        save_frame(seasonal[[c for c in RELEVANT_COLUMNS if c in seasonal.columns]], f"seasonal_{year}")
+        schedules = nfl.import_schedules([year])
+        save_frame(schedules[SCHEDULE_COLUMNS], f"schedules_{year}")
+    save_league(record_league())
+
+
+# ---------------------------------------------------------------------------
+# Synthetic fixtures
+# ---------------------------------------------------------------------------
+
+def _synthetic_schedule(rng, season):
+    rows = []
+    for week in range(1, NFL_SEASON_WEEKS + 1):
+        teams = list(rng.permutation(NFL_TEAMS))
+        if 5 <= week <= 14:
+            teams = teams[2:]  # two teams on bye
+        for i in range(0, len(teams), 2):
+            rows.append((season, "REG", week, teams[i], teams[i + 1]))
+    return pd.DataFrame(rows, columns=SCHEDULE_COLUMNS)
+
+
+def _synthetic_weekly(rng, players, schedule, season, last_week):
+    opponents = {}
+    for g in schedule.itertuples():
+        opponents[(g.week, g.home_team)] = g.away_team
+        opponents[(g.week, g.away_team)] = g.home_team
+    rows = []
+    for p in players.itertuples():
+        is_rb = p.pos == "RB"
+        for week in range(1, last_week + 1):
+            opponent = opponents.get((week, p.team))
+            if opponent is None:
+                continue
+            carries = rng.poisson(12 if is_rb else 0.5)
+            targets = rng.poisson(3 if is_rb else 6)
+            receptions = rng.binomial(targets, 0.65)
+            rows.append((
+                p.player, p.pos, p.team, opponent, season, week,
+                carries, round(carries * rng.normal(4.2, 1.5), 1), rng.poisson(0.3 if is_rb else 0.02),
+                receptions, targets, round(receptions * rng.normal(10.5, 4.0), 1), rng.poisson(0.1 if is_rb else 0.35),
+            ))
+    return pd.DataFrame(rows, columns=WEEKLY_COLUMNS)
+
+
+def _synthetic_seasonal(weekly):
+    totals = weekly.groupby(["player_display_name", "position"], as_index=False).agg(
+        carries=("carries", "sum"), rushing_yards=("rushing_yards", "sum"),
+        rushing_tds=("rushing_tds", "sum"), receptions=("receptions", "sum"),
+        targets=("targets", "sum"), receiving_yards=("receiving_yards", "sum"),
+        receiving_tds=("receiving_tds", "sum"), games=("week", "count"),
+    )
+    team_targets = totals["targets"].sum() / len(NFL_TEAMS)
+    totals["tgt_sh"] = (totals["targets"] / team_targets).round(3)
+    totals["ry_sh"] = (totals["receiving_yards"] / totals["receiving_yards"].sum() * len(NFL_TEAMS)).round(3)
+    totals["wopr_y"] = (1.5 * totals["tgt_sh"] + 0.7 * totals["ry_sh"]).round(3)
+    totals["rtd_sh"] = (totals["receiving_tds"] / max(totals["receiving_tds"].sum(), 1) * len(NFL_TEAMS)).round(3)
+    totals["yptmpa"] = (totals["receiving_yards"] / (totals["games"] * 35)).round(3)
+    return totals[RELEVANT_COLUMNS]
+
+
+def _synthetic_league(rng, players, season, current_week, n_teams=10, roster_size=16):
+    reg_season = 14
+    names = [
+        "Gridiron Gurus", "End Zone Elite", "Blitz Brigade", "Hail Mary Heroes",
+        "Red Zone Raiders", "Fourth and Long", "Pigskin Prophets", "Sack Masters",
+        "Touchdown Tyrants", "Waiver Wire Wizards", "Bench Warmers", "Draft Day Dynasty",
+    ][:n_teams]
+    pool = players.sample(frac=1.0, random_state=int(rng.integers(1 << 31))).reset_index(drop=True)
+
+    def player(row):
+        proj = round(float(rng.gamma(4.0, 2.5)), 2)
+        return {
+            "name": row.player, "playerId": int(rng.integers(10**6, 10**7)),
+            "position": row.pos, "proTeam": row.team,
+            "projected_total_points": round(proj * 17, 1),
+            "projected_avg_points": proj,
+            "avg_points": round(proj * float(rng.normal(1.0, 0.2)), 2),
+        }
+
+    # Circle-method round robin, repeated to cover the regular season
+    ids = list(range(1, n_teams + 1))
+    rounds = []
+    rotation = ids[:]
+    for _ in range(n_teams - 1):
+        rounds.append([(rotation[i], rotation[-1 - i]) for i in range(n_teams // 2)])
+        rotation = [rotation[0]] + [rotation[-1]] + rotation[1:-1]
+    weeks = [rounds[w % len(rounds)] for w in range(reg_season)]
+
+    schedule = {tid: [] for tid in ids}
+    for pairs in weeks:
+        for home, away in pairs:
+            schedule[home].append(away)
+            schedule[away].append(home)
+
+    scores = {tid: [0.0] * reg_season for tid in ids}
+    for week in range(current_week):
+        for tid in ids:
+            full = week < current_week - 1
+            scores[tid][week] = round(float(rng.normal(115, 22)) * (1.0 if full else 0.45), 2)
+
+    teams = []
+    for idx, tid in enumerate(ids):
+        wins = losses = 0
+        pf = pa = 0.0
+        for week in range(current_week - 1):
+            opp = schedule[tid][week]
+            pf += scores[tid][week]
+            pa += scores[opp][week]
+            if scores[tid][week] > scores[opp][week]:
+                wins += 1
+            else:
+                losses += 1
+        roster = pool.iloc[idx * roster_size:(idx + 1) * roster_size]
+        teams.append({
+            "team_id": tid, "team_name": names[idx],
+            "team_abbrev": "".join(w[0] for w in names[idx].split())[:4].upper(),
+            "owner": f"Owner {tid}", "wins": wins, "losses": losses,
+            "points_for": round(pf, 2), "points_against": round(pa, 2),
+            "schedule": schedule[tid], "scores": scores[tid],
+            "roster": [player(r) for r in roster.itertuples()],
+        })
+
+    free_agents = pool.iloc[n_teams * roster_size:]
+    return {
+        "league_id": 123456, "year": season, "current_week": current_week,
+        "settings": {"name": "Benchmark League", "reg_season_count": reg_season, "playoff_team_count": 4},
+        "teams": teams,
+        "free_agents": [player(r) for r in free_agents.itertuples()],
+    }
+
+
+def record_synthetic(season, seed=2025):
+    rng = np.random.default_rng(seed)
+    ftn = pd.read_csv(ROOT / "data" / "ftn_airyards_2025_all.csv")
+    players = ftn.sort_values("week").drop_duplicates("player", keep="last")[["player", "pos", "team"]]
+    players = players[players["team"].isin(NFL_TEAMS)]
+    played_weeks = int(ftn["week"].max())
+
+    for year, last_week in ((season, played_weeks), (season - 1, NFL_SEASON_WEEKS)):
+        schedule = _synthetic_schedule(rng, year)
+        weekly = _synthetic_weekly(rng, players, schedule, year, last_week)
+        save_frame(schedule, f"schedules_{year}")
+        save_frame(weekly, f"weekly_{year}")
+        save_frame(_synthetic_seasonal(weekly), f"seasonal_{year}")
+    save_league(_synthetic_league(rng, players, season, current_week=played_weeks + 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--live", action="store_true", help="Snapshot ESPN and nfl_data_py (needs network + .env)")
+    mode.add_argument("--synthetic", action="store_true", help="Build deterministic fixtures offline")
+    parser.add_argument("--season", type=int, default=2025)
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.INFO)
+    if args.live:
+        record_live(args.season)
+    else:
+        record_synthetic(args.season, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
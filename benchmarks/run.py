@@ -0,0 +1,404 @@
+"""
+Offline benchmark suite for the app's hot paths.
+
+Every case runs against the recorded fixtures (see benchmarks/fixtures.py)
+and reports latency percentiles, throughput and peak traced memory.
+Results are written to benchmarks/results/ so runs can be compared
+across commits.
+
+Usage:
+    python -m benchmarks.run                      # run everything
+    python -m benchmarks.run --only routes,cache  # run cases matching a prefix
+    python -m benchmarks.run --save               # store results for this commit
+    python -m benchmarks.run --compare BASE [HEAD]
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.fixtures import offline, load_league_payload, SECOND_LEAGUE_ID
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+CASES = []
+
+
+def case(name, iterations=50, warmup=1):
+    """Register a benchmark. The decorated function receives the fixture
+    context and returns the zero-argument callable to time."""
+    def decorator(setup):
+        CASES.append({"name": name, "setup": setup, "iterations": iterations, "warmup": warmup})
+        return setup
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+
+@case("cache.cached.hit", iterations=20000)
+def bench_cache_hit(ctx):
+    from services.cache import cached
+
+    @cached(ttl=3600)
+    def lookup(position=None):
+        return position
+
+    lookup(position="WR")
+    return lambda: lookup(position="WR")
+
+
+@case("cache.cached.miss", iterations=20000, warmup=0)
+def bench_cache_miss(ctx):
+    from services.cache import cached
+
+    @cached(ttl=3600)
+    def lookup(n):
+        return n
+
+    counter = iter(range(10**9))
+    return lambda: lookup(next(counter))
+
+
+@case("csv.StatsLoader.get_team_stats", iterations=50)
+def bench_team_stats(ctx):
+    from csv_loader import StatsLoader
+
+    loader = StatsLoader(csv_dir=ctx.csv_dir)
+    return lambda: loader.get_team_stats("KC")
+
+
+@case("datamanager.get_data.cold", iterations=5, warmup=0)
+def bench_get_data_cold(ctx):
+    from datamanager import DataManager
+
+    players = ctx.players[:25]
+
+    def run():
+        DataManager().get_data(players, "receiving_yards")
+    return run
+
+
+@case("datamanager.get_data.warm", iterations=50)
+def bench_get_data_warm(ctx):
+    from datamanager import DataManager
+
+    manager = DataManager()
+    players = ctx.players[:25]
+    return lambda: manager.get_data(players, "receiving_yards")
+
+
+@case("scraper.calculate_z_score_projection", iterations=20)
+def bench_projection(ctx):
+    from scraper import calculate_z_score_projection
+
+    player = ctx.players[0]
+    return lambda: calculate_z_score_projection(player, ctx.season)
+
+
+@case("scraper.get_mass_projections", iterations=3, warmup=0)
+def bench_mass_projections(ctx):
+    from scraper import get_mass_projections
+
+    players = ctx.players[:20]
+    return lambda: get_mass_projections(players, ctx.season)
+
+
+@case("defense.build_defense_table", iterations=20)
+def bench_defense_table(ctx):
+    from defense import build_defense_table, latest_week
+
+    week = latest_week(ctx.season)
+    return lambda: build_defense_table.__wrapped__(ctx.season, week)
+
+
+@case("defense.z_score", iterations=20000)
+def bench_defense_lookup(ctx):
+    from defense import get_defense_table
+
+    table = get_defense_table(ctx.season)
+    return lambda: table.z_score("KC", "WR", "receiving_yards_allowed")
+
+
+@case("simulator.run_simulation", iterations=10)
+def bench_simulation(ctx):
+    import espn_client
+    from simulator import run_simulation
+
+    inputs = espn_client.get_simulation_inputs(espn_client.default_league())
+    return lambda: run_simulation(inputs, n_sims=20000, seed=7)
+
+
+@case("boot.import_main", iterations=5, warmup=0)
+def bench_import_main(ctx):
+    from benchmarks.record_fixtures import ROOT
+
+    def run():
+        subprocess.run([sys.executable, "-c", "import main"], cwd=ROOT, check=True)
+    return run
+
+
+@case("boot.warmup", iterations=5, warmup=0)
+def bench_warmup(ctx):
+    from csv_loader import StatsLoader
+    from services.warmup import run_warmup
+    import espn_client
+
+    names = ["league", "standings", "scoreboard", "csv"]
+
+    league = espn_client.default_league()
+
+    def run():
+        # Fresh caches each iteration so every task does real work
+        loader = StatsLoader(csv_dir=ctx.csv_dir)
+        tasks = {
+            "league": lambda: espn_client.get_league_info.__wrapped__(league),
+            "standings": lambda: espn_client.get_standings(league),
+            "scoreboard": lambda: espn_client.get_scoreboard.__wrapped__(league),
+            "csv": loader.preload,
+        }
+        run_warmup(tasks, names)
+    return run
+
+
+def _route_case(name, path, iterations=100):
+    @case(f"routes.{name}", iterations=iterations)
+    def setup(ctx):
+        from fastapi.testclient import TestClient
+        import main
+        from csv_loader import StatsLoader
+
+        main.stats_loader = StatsLoader(csv_dir=ctx.csv_dir)
+        client = TestClient(main.app)
+
+        def run():
+            response = client.get(path)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {path} returned {response.status_code}")
+        return run
+    return setup
+
+
+_route_case("home", "/")
+_route_case("standings", "/standings")
+_route_case("matchups", "/matchups")
+_route_case("teams", "/teams")
+_route_case("waivers", "/waivers?pos=WR")
+_route_case("team", "/team/KC")
+_route_case("odds", "/odds?seed=7", iterations=20)
+_route_case("league_standings", f"/leagues/{SECOND_LEAGUE_ID}/2025/standings")
+_route_case("export_weekly", "/export/weekly.csv", iterations=20)
+_route_case("export_projections", "/export/projections.csv?limit=20", iterations=5)
+
+
+@case("export.stream_csv", iterations=5)
+def bench_stream_csv(ctx):
+    """100k rows through the CSV encoder; peak memory should stay at one chunk."""
+    from exports import PROJECTION_COLUMNS
+    from services.export import stream_csv
+
+    def run():
+        rows = (("Player", "WR", week % 18, "KC", 12.5) for week in range(100_000))
+        for _ in stream_csv(PROJECTION_COLUMNS, rows):
+            pass
+    return run
+
+
+@case("export.stream_parquet", iterations=5)
+def bench_stream_parquet(ctx):
+    """Same rows through the Parquet encoder, one row group per chunk."""
+    from exports import PROJECTION_COLUMNS
+    from services.export import stream_parquet
+
+    def run():
+        rows = (("Player", "WR", week % 18, "KC", 12.5) for week in range(100_000))
+        for _ in stream_parquet(PROJECTION_COLUMNS, rows):
+            pass
+    return run
+
+
+@case("cache.league_namespaces", iterations=20, warmup=0)
+def bench_league_namespaces(ctx):
+    """Fill one namespace per league, as a multi-league deployment would."""
+    from espn_client import LeagueKey, get_standings
+
+    counter = iter(range(10**9))
+
+    def run():
+        base = next(counter) * 50
+        for league_id in range(base, base + 50):
+            get_standings(LeagueKey(league_id, ctx.season))
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def measure(fn, iterations, warmup):
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+
+    # Separate pass so tracemalloc overhead doesn't skew the timings
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    to_ms = 1000.0
+    return {
+        "iterations": iterations,
+        "mean_ms": statistics.fmean(timings) * to_ms,
+        "p50_ms": percentile(timings, 50) * to_ms,
+        "p95_ms": percentile(timings, 95) * to_ms,
+        "p99_ms": percentile(timings, 99) * to_ms,
+        "max_ms": timings[-1] * to_ms,
+        "ops_per_sec": iterations / total if total else 0.0,
+        "peak_mem_kb": max(0, peak - base) / 1024,
+    }
+
+
+def run_cases(selected=None, scale=1.0):
+    results = {}
+    with offline() as ctx:
+        payload = load_league_payload()
+        ctx.players = [
+            p["name"] for t in payload["teams"] for p in t["roster"] if p["position"] in ("RB", "WR", "TE")
+        ]
+        for bench in CASES:
+            name = bench["name"]
+            if selected and not any(name.startswith(s) for s in selected):
+                continue
+            iterations = max(1, int(bench["iterations"] * scale))
+            try:
+                fn = bench["setup"](ctx)
+                results[name] = measure(fn, iterations, bench["warmup"])
+            except Exception as e:
+                logger.error(f"Benchmark {name} failed: {e}")
+                results[name] = {"error": str(e)}
+            print_row(name, results[name])
+    return results
+
+
+def print_row(name, r):
+    if "error" in r:
+        print(f"{name:<40} ERROR {r['error']}")
+        return
+    print(
+        f"{name:<40} p50 {r['p50_ms']:9.3f}ms  p95 {r['p95_ms']:9.3f}ms  "
+        f"p99 {r['p99_ms']:9.3f}ms  {r['ops_per_sec']:10.1f} ops/s  "
+        f"peak {r['peak_mem_kb']:9.1f}KB"
+    )
+
+
+def git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+        dirty = subprocess.run(["git", "status", "--porcelain"], capture_output=True, text=True).stdout
+        return out.stdout.strip() + ("-dirty" if dirty.strip() else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(results):
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    revision = git_revision()
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = RESULTS_DIR / f"{stamp}-{revision}.json"
+    path.write_text(json.dumps({
+        "revision": revision,
+        "timestamp": stamp,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }, indent=2))
+    print(f"Saved {path}")
+    return path
+
+
+def resolve_results(ref):
+    """Accept a results file path or a commit prefix (latest run wins)."""
+    path = Path(ref)
+    if path.is_file():
+        return path
+    matches = sorted(RESULTS_DIR.glob(f"*-{ref}*.json"))
+    if not matches:
+        raise SystemExit(f"No saved results match {ref!r} in {RESULTS_DIR}")
+    return matches[-1]
+
+
+def compare(base_ref, head_ref=None):
+    base = json.loads(resolve_results(base_ref).read_text())
+    if head_ref:
+        head = json.loads(resolve_results(head_ref).read_text())
+    else:
+        runs = sorted(RESULTS_DIR.glob("*.json"))
+        head = json.loads(runs[-1].read_text())
+
+    print(f"{'benchmark':<40} {'base p50':>10} {'head p50':>10} {'Δ p50':>8} {'Δ p95':>8} {'Δ peak':>8}")
+    print(f"{'':<40} {base['revision']:>10} {head['revision']:>10}")
+
+    def delta(key, b, h):
+        return f"{(h[key] - b[key]) / b[key] * 100:+7.1f}%" if b.get(key) else "     n/a"
+
+    for name in sorted(set(base["results"]) | set(head["results"])):
+        b = base["results"].get(name, {})
+        h = head["results"].get(name, {})
+        if "p50_ms" not in b or "p50_ms" not in h:
+            print(f"{name:<40} {'-':>10} {'-':>10}")
+            continue
+        print(
+            f"{name:<40} {b['p50_ms']:9.3f}ms {h['p50_ms']:9.3f}ms "
+            f"{delta('p50_ms', b, h)} {delta('p95_ms', b, h)} {delta('peak_mem_kb', b, h)}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="Comma-separated benchmark name prefixes")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply iteration counts")
+    parser.add_argument("--save", action="store_true", help="Store results in benchmarks/results/")
+    parser.add_argument("--compare", nargs="+", metavar="REF", help="Compare saved runs (BASE [HEAD])")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare[:2])
+        return
+
+    selected = args.only.split(",") if args.only else None
+    results = run_cases(selected, scale=args.scale)
+    if args.save:
+        save_results(results)
+
+
+if __name__ == "__main__":
+    main()
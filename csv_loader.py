@@ -1,44 +1,61 @@
-import pandas as pd
 from pathlib import Path
+from services.timing import timed
+from tools import lazy_import
+
+pd = lazy_import("pandas")
+
+AIR_YARDS_FILE = "ftn_airyards_2025_all.csv"
+SNAP_COUNTS_FILE = "Snap_Count_Percentages.csv"
 
 
 class StatsLoader:
     def __init__(self, csv_dir="data"):
         self.csv_dir = Path(csv_dir)
+        self._frames = {}  # {file name: (mtime, DataFrame)}
+
+    def _read_csv(self, name):
+        """Read a CSV once and reuse it until the file changes on disk"""
+        path = self.csv_dir / name
+        mtime = path.stat().st_mtime
+        cached = self._frames.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        df = self._parse_csv(path)
+        self._frames[name] = (mtime, df)
+        return df
+
+    @timed("csv")
+    def _parse_csv(self, path):
+        return pd.read_csv(path)
 
     def load_air_yards(self):
-        """Load ftn_Airyards by week"""
-        df = pd.read_csv(self.csv_dir / "ftn_Airyards.csv")
-        return df
+        """Load FTN air yards, one row per player per week"""
+        return self._read_csv(AIR_YARDS_FILE)
 
     def load_snap_counts(self):
-        """Load snap count percentages"""
-        df = pd.read_csv(self.csv_dir / "snap_count_percentages.csv")
-        return df
+        """Load snap count percentages, one column per week"""
+        return self._read_csv(SNAP_COUNTS_FILE)
+
+    def preload(self):
+        """Parse every CSV up front (used by the startup warm-up)"""
+        self.load_air_yards()
+        self.load_snap_counts()
 
     def get_team_stats(self, team_name, weeks=None):
         """Get stats for specific team, optionally filter by weeks"""
         air_yards = self.load_air_yards()
         snaps = self.load_snap_counts()
 
-        team_air = (
-            air_yards[air_yards["Team"] == team_name]
-            if "Team" in air_yards.columns
-            else None
-        )
-        team_snaps = (
-            snaps[snaps["Team"] == team_name] if "Team" in snaps.columns else None
-        )
+        team_air = air_yards[air_yards["team"] == team_name]
+        team_snaps = snaps[snaps["Team"] == team_name]
 
         if weeks:
-            week_cols = [col for col in team_air.columns if col.startswith("Week")]
-            week_cols = week_cols[-weeks:]
-            team_air = team_air[["Team"] + week_cols]
-            team_snaps = team_snaps[["Team"] + week_cols]
+            recent = sorted(air_yards["week"].unique())[-weeks:]
+            team_air = team_air[team_air["week"].isin(recent)]
+            week_cols = [str(w) for w in recent if str(w) in snaps.columns]
+            team_snaps = team_snaps[["Player", "Pos", "Team"] + week_cols]
 
         return {
-            "air_yards": team_air.to_dict("records") if team_air is not None else [],
-            "snap_counts": team_snaps.to_dict("records")
-            if team_snaps is not None
-            else [],
+            "air_yards": team_air.fillna("").to_dict("records"),
+            "snap_counts": team_snaps.fillna("").to_dict("records"),
         }
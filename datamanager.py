@@ -1,8 +1,10 @@
 from scraper import get_player_weekly_stats
-from tools import get_season, NFL_SEASON_WEEKS
-import pandas as pd
+from tools import get_season, lazy_import, NFL_SEASON_WEEKS
+from services.timing import timed
 import logging
 
+pd = lazy_import("pandas")
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +25,7 @@ class DataManager:
         """Return all cached DataFrames."""
         return self.df
     
+    @timed("datamanager")
     def add_new_player_data(self, player_name, year=None):
         """
         Fetch and cache weekly stats for a player.
@@ -0,0 +1,121 @@
+"""
+Defense-vs-position strength table for the projection engine.
+
+For every defense, position and stat the table holds what the defense
+allows per game and that value's z-score against the rest of the league,
+keyed by (team, position, stat) for constant-time lookup. A table is built
+once per completed week of data and shared by every projection.
+
+Values are the yards, TDs and volume allowed to each position, summed
+from the weekly player data by opponent. DEFENSE_WINDOW limits them to
+each defense's last N games (0 = the whole season).
+"""
+from dataclasses import dataclass
+import logging
+import os
+
+import history
+from services.cache import cached
+from services.timing import timed
+from tools import lazy_import
+
+pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+WINDOW = int(os.getenv("DEFENSE_WINDOW", "0"))
+
+STAT_MAPPING = {
+    'RB': ('rushing_yards_allowed', 'rushing_tds_allowed', 'carries_allowed'),
+    'WR': ('receiving_yards_allowed', 'receiving_tds_allowed', 'targets_allowed'),
+    'TE': ('receiving_yards_allowed', 'receiving_tds_allowed', 'targets_allowed'),
+}
+ALLOWED_STATS = ('carries', 'rushing_yards', 'rushing_tds', 'targets', 'receiving_yards', 'receiving_tds')
+
+
+@dataclass(frozen=True, slots=True)
+class DefenseTable:
+    year: int
+    through_week: int
+    window: int
+    entries: dict  # {(team, position, stat): (allowed, z_score)}
+
+    def lookup(self, team, position, stat):
+        """(allowed, z_score) for a defense, or None if it has no data."""
+        return self.entries.get((team, position, stat))
+
+    def z_score(self, team, position, stat):
+        entry = self.entries.get((team, position, stat))
+        return None if entry is None else entry[1]
+
+    def frame(self, position):
+        """One row per defense with the stats relevant to `position`."""
+        stats = STAT_MAPPING.get(position, ())
+        rows = {}
+        for (team, pos, stat), (allowed, _) in self.entries.items():
+            if pos == position and stat in stats:
+                rows.setdefault(team, {'team': team})[stat] = allowed
+        return pd.DataFrame(list(rows.values()), columns=['team', *stats])
+
+
+def _weekly_allowed(year, through_week, window):
+    """Per-game stats allowed to each position, indexed by (team, position)."""
+    weekly = history.get_weekly_data(year)
+    if 'opponent_team' not in weekly.columns:
+        raise ValueError(f"Weekly data for {year} has no opponent_team column")
+
+    mask = weekly['position'].isin(STAT_MAPPING) & weekly['week'].between(1, through_week)
+    if 'season_type' in weekly.columns:
+        mask &= weekly['season_type'] == 'REG'
+    rows = weekly.loc[mask, ['opponent_team', 'position', 'week', *ALLOWED_STATS]]
+
+    # Games each defense played (optionally only its last `window`), so a
+    # week where a position never touched the ball still counts as zero
+    games = rows[['opponent_team', 'week']].drop_duplicates()
+    if window:
+        games = games.sort_values('week').groupby('opponent_team').tail(window)
+        rows = rows.merge(games, on=['opponent_team', 'week'])
+    game_counts = games.groupby('opponent_team').size()
+
+    totals = rows.groupby(['opponent_team', 'position'])[list(ALLOWED_STATS)].sum()
+    totals = totals.reindex(
+        pd.MultiIndex.from_product([game_counts.index, list(STAT_MAPPING)]), fill_value=0
+    )
+    allowed = totals.div(game_counts, axis=0, level='opponent_team').fillna(0)
+    allowed.columns = [f"{c}_allowed" for c in allowed.columns]
+    allowed.index.names = ['team', 'position']
+    return allowed
+
+
+@cached(ttl=float("inf"))  # keyed on the week, so a new week builds a new table
+@timed("defense")
+def build_defense_table(year, through_week, window=WINDOW):
+    allowed = _weekly_allowed(year, through_week, window)
+
+    # z-score of each defense against the league, per position and stat
+    by_position = allowed.groupby(level='position')
+    std = by_position.transform('std').replace(0, 1).fillna(1)
+    z = (allowed - by_position.transform('mean')) / std
+
+    allowed_s, z_s = allowed.stack(), z.stack()
+    entries = {
+        key: (float(a), float(zv))
+        for key, a, zv in zip(allowed_s.index, allowed_s.to_numpy(), z_s.to_numpy())
+    }
+    logger.info(f"Built defense table for {year} through week {through_week} ({len(entries)} entries)")
+    return DefenseTable(year=year, through_week=through_week, window=window, entries=entries)
+
+
+def latest_week(year):
+    """Last regular-season week with data, which is what a table is built through."""
+    # Cached with the weekly frame itself, so it never lags the data
+    return history.get_latest_week(year)
+
+
+def get_defense_table(year):
+    """The current defense table for a season, or None if it can't be built."""
+    try:
+        return build_defense_table(year, latest_week(year))
+    except Exception as e:
+        logger.error(f"Error building defense table for {year}: {e}")
+        return None
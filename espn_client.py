@@ -1,71 +1,257 @@
+import logging
 import os
+import threading
+from functools import lru_cache
+from importlib import metadata
+from typing import TYPE_CHECKING, NamedTuple
 from dotenv import load_dotenv
-from espn_api.football import League
+from records import (
+    FreeAgent, LeagueInfo, Matchup, SimulationInputs, StandingRow, sim_team, team_summary
+)
 from services.cache import cached
+from services.timing import span, timed
 
-load_dotenv()
-LEAGUE_ID = int(os.getenv("ESPN_LEAGUE_ID"))
-YEAR = int(os.getenv("ESPN_YEAR"))
-ESPN_S2 = os.getenv("ESPN_S2")
-SWID = os.getenv("ESPN_SWID")
+if TYPE_CHECKING:
+    from espn_api.football import League
 
+logger = logging.getLogger(__name__)
 
-def get_league() -> League:
-    return League(
-        league_id=LEAGUE_ID,
-        year=YEAR,
-        espn_s2=ESPN_S2,
-        swid=SWID,
+ESPN_POOL_SIZE = int(os.getenv("ESPN_POOL_SIZE", "16"))
+ESPN_HTTP_POOL = os.getenv("ESPN_HTTP_POOL", "1").lower() not in ("0", "false", "no")
+# espn_api releases whose espn_requests module-level `requests` we have checked
+POOL_ESPN_API_VERSIONS = ("0.45",)
+
+
+class LeagueKey(NamedTuple):
+    league_id: int
+    year: int
+
+    def __str__(self):
+        return f"{self.league_id}:{self.year}"
+
+
+@lru_cache(maxsize=None)
+def _load_env() -> None:
+    load_dotenv()
+
+
+@lru_cache(maxsize=None)
+def default_league() -> LeagueKey:
+    """League served by the un-prefixed routes (ESPN_LEAGUE_ID / ESPN_YEAR)."""
+    _load_env()
+    return LeagueKey(int(os.getenv("ESPN_LEAGUE_ID")), int(os.getenv("ESPN_YEAR")))
+
+
+@lru_cache(maxsize=None)
+def configured_leagues() -> tuple:
+    """
+    The default league plus any listed in ESPN_LEAGUES, formatted as
+    "league_id[:year],..." (year defaults to ESPN_YEAR).
+    """
+    default = default_league()
+    leagues = [default]
+    for item in os.getenv("ESPN_LEAGUES", "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        league_id, _, year = item.partition(":")
+        key = LeagueKey(int(league_id), int(year) if year else default.year)
+        if key not in leagues:
+            leagues.append(key)
+    return tuple(leagues)
+
+
+def resolve_league(league_id: int | None = None, year: int | None = None) -> LeagueKey | None:
+    """
+    Map request parameters to a configured LeagueKey, or None. Without a
+    year, a league's first configured season is used; seasons that aren't
+    configured return None rather than reaching ESPN.
+    """
+    leagues = configured_leagues()
+    if league_id is None:
+        league_id = default_league().league_id
+    seasons = [k for k in leagues if k.league_id == league_id]
+    if not seasons:
+        return None
+    if year is None:
+        return seasons[0]
+    key = LeagueKey(league_id, year)
+    return key if key in seasons else None
+
+
+def get_credentials(league: LeagueKey) -> dict:
+    """
+    Cookies for a league: ESPN_S2_<league_id> / ESPN_SWID_<league_id>,
+    falling back to the shared ESPN_S2 / ESPN_SWID.
+    """
+    _load_env()
+    return {
+        "league_id": league.league_id,
+        "year": league.year,
+        "espn_s2": os.getenv(f"ESPN_S2_{league.league_id}") or os.getenv("ESPN_S2"),
+        "swid": os.getenv(f"ESPN_SWID_{league.league_id}") or os.getenv("ESPN_SWID"),
+    }
+
+
+class _PooledRequests:
+    """
+    Stand-in for the `requests` module inside espn_api that sends its GETs
+    through one keep-alive Session, so every league reuses pooled
+    connections instead of opening a new one per call.
+    """
+
+    def __init__(self, module, session):
+        self._module = module
+        self._session = session
+
+    def get(self, *args, **kwargs):
+        return self._session.get(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+
+def _espn_api_version() -> str:
+    return metadata.version("espn_api")
+
+
+_pool_lock = threading.Lock()
+_pool_installed: bool | None = None  # None until the first install attempt
+
+
+def _install_http_pool() -> bool:
+    """
+    Route espn_api's GETs through a pooled Session, once per process. The
+    lock makes concurrent first calls (parallel warm-up tasks) wait for a
+    single attempt instead of racing to swap the module attribute.
+    """
+    global _pool_installed
+    with _pool_lock:
+        if _pool_installed is None:
+            _pool_installed = _swap_in_http_pool()
+        return _pool_installed
+
+
+def _swap_in_http_pool() -> bool:
+    """
+    This swaps a private module attribute, so it only happens on espn_api
+    versions known to look it up at call time; otherwise espn_api keeps
+    its own requests.
+    """
+    from http.cookiejar import DefaultCookiePolicy
+    import requests
+    from requests.adapters import HTTPAdapter
+    import espn_api.requests.espn_requests as espn_requests
+
+    if not ESPN_HTTP_POOL:
+        return False
+    current = getattr(espn_requests, "requests", None)
+    if isinstance(current, _PooledRequests):
+        return True
+    version = _espn_api_version()
+    if not version.startswith(POOL_ESPN_API_VERSIONS) or current is not requests:
+        logger.warning(f"espn_api {version} is not known to support the shared HTTP pool; not installing it")
+        return False
+
+    session = requests.Session()
+    # Cookies are passed per request; never let one league's responses
+    # leave cookies in the shared jar for the next league
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=ESPN_POOL_SIZE))
+    espn_requests.requests = _PooledRequests(requests, session)
+    return True
+
+
+def uninstall_http_pool() -> None:
+    """Give espn_api back its own `requests` module and close the pool."""
+    import espn_api.requests.espn_requests as espn_requests
+
+    global _pool_installed
+    with _pool_lock:
+        pooled = espn_requests.requests
+        if isinstance(pooled, _PooledRequests):
+            espn_requests.requests = pooled._module
+            pooled._session.close()
+        _pool_installed = None
+
+
+@timed("espn")
+def get_league(league: LeagueKey) -> "League":
+    # Not cached: the full League (rosters, schedules, players) is large.
+    # Cache the trimmed records built from it instead.
+    from espn_api.football import League
+
+    _install_http_pool()
+    return League(**get_credentials(league))
+
+
+@cached(ttl=300, per_league=True)  # 5 min
+def get_league_info(league: LeagueKey) -> LeagueInfo:
+    espn_league = get_league(league)
+    return LeagueInfo(
+        name=espn_league.settings.name,
+        current_week=espn_league.current_week,
+        teams=tuple(team_summary(t) for t in espn_league.teams),
     )
 
 
-@cached(ttl=300)  # 5 min
-def get_standings():
-    league = get_league()
-    teams = league.teams
-    # Return simple dicts for templating
-    return sorted(
-        [
-            {
-                "team": t.team_name,
-                "wins": t.wins,
-                "losses": t.losses,
-                "points_for": t.points_for,
-            }
-            for t in teams
-        ],
-        key=lambda x: (-x["wins"], -x["points_for"]),
+def get_teams(league: LeagueKey) -> tuple:
+    return get_league_info(league).teams
+
+
+def get_standings(league: LeagueKey) -> tuple:
+    # Not cached: sorting a dozen cached records is cheaper than a second
+    # copy, and standings stay exactly as fresh as get_league_info
+    rows = (
+        StandingRow(team=t.team_name, wins=t.wins, losses=t.losses, points_for=t.points_for)
+        for t in get_league_info(league).teams
     )
+    return tuple(sorted(rows, key=lambda r: (-r.wins, -r.points_for)))
 
 
-@cached(ttl=180)
-def get_scoreboard():
-    league = get_league()
-    sb = league.scoreboard()
-    out = []
-    for m in sb:
-        out.append(
-            {
-                "home": m.home_team.team_name,
-                "home_score": round(m.home_score, 2),
-                "away": m.away_team.team_name,
-                "away_score": round(m.away_score, 2),
-            }
+@cached(ttl=180, per_league=True)
+def get_scoreboard(league: LeagueKey) -> tuple:
+    espn_league = get_league(league)
+    with span("espn"):
+        sb = espn_league.scoreboard()
+    return tuple(
+        Matchup(
+            home=m.home_team.team_name,
+            home_score=round(m.home_score, 2),
+            away=m.away_team.team_name,
+            away_score=round(m.away_score, 2),
+        )
+        for m in sb
+    )
+
+
+@cached(ttl=600, per_league=True)
+def get_free_agents(league: LeagueKey, position: str | None = None) -> tuple:
+    espn_league = get_league(league)
+    with span("espn"):
+        fa = espn_league.free_agents(position=position) if position else espn_league.free_agents()
+    return tuple(
+        FreeAgent(
+            name=p.name,
+            pos=p.position,
+            pro_team=p.proTeam,
+            proj=getattr(p, "projected_total_points", None),
         )
-    return out
-
-
-@cached(ttl=600)
-def get_free_agents(position: str | None = None):
-    league = get_league()
-    fa = league.free_agents(position=position) if position else league.free_agents()
-    # Trim to a lighter payload for the template
-    return [
-        {
-            "name": p.name,
-            "pos": p.position,
-            "pro_team": p.proTeam,
-            "proj": getattr(p, "projected_total_points", None),
-        }
         for p in fa[:200]
-    ]
+    )
+
+
+@cached(ttl=180, per_league=True)
+def get_simulation_inputs(league: LeagueKey) -> SimulationInputs:
+    espn_league = get_league(league)
+    settings = espn_league.settings
+    slots = getattr(settings, "position_slot_counts", None) or {}
+    starters = sum(n for slot, n in slots.items() if slot not in ("BE", "IR")) or 9
+    return SimulationInputs(
+        year=league.year,
+        current_week=espn_league.current_week,
+        reg_season_count=settings.reg_season_count,
+        playoff_team_count=settings.playoff_team_count,
+        starters=starters,
+        teams=tuple(sim_team(t, espn_league.current_week) for t in espn_league.teams),
+    )
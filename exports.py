@@ -0,0 +1,67 @@
+"""
+Row producers for the /export endpoints.
+
+Each yields plain tuples matching its column spec, reading a season's
+weekly data a slice at a time (or projecting a small batch of players at
+a time), so an export never builds the full result in memory.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from scraper import calculate_weekly_projections
+from services.export import CHUNK_ROWS, chunked
+from services.timing import span, submit
+from tools import get_fantasy_positions
+
+WEEKLY_STATS = [
+    "carries", "rushing_yards", "rushing_tds",
+    "receptions", "targets", "receiving_yards", "receiving_tds",
+]
+WEEKLY_COLUMNS = [
+    ("player", "str"), ("position", "str"), ("team", "str"), ("opponent", "str"),
+    ("season", "int"), ("week", "int"),
+    *((stat, "float") for stat in WEEKLY_STATS),
+]
+PROJECTION_COLUMNS = [
+    ("player", "str"), ("position", "str"), ("week", "int"),
+    ("opponent", "str"), ("projection", "float"),
+]
+
+
+def iter_weekly_rows(weekly, position=None, player=None):
+    """Player x week stats from a season's weekly frame, in its stored order."""
+    source = [
+        "player_display_name", "position", "recent_team", "opponent_team", "season", "week",
+        *WEEKLY_STATS,
+    ]
+    for start in range(0, len(weekly), CHUNK_ROWS):
+        part = weekly.iloc[start:start + CHUNK_ROWS]
+        mask = part["week"] != 0  # 0 = offseason
+        if "season_type" in part.columns:
+            mask &= part["season_type"] == "REG"
+        if position:
+            mask &= part["position"] == position
+        if player:
+            mask &= part["player_display_name"] == player
+        part = part.loc[mask].reindex(columns=source)
+        part[WEEKLY_STATS] = part[WEEKLY_STATS].fillna(0)
+        part = part.fillna("")
+        for row in part.itertuples(index=False, name=None):
+            yield (*row[:4], int(row[4]), int(row[5]), *map(float, row[6:]))
+
+
+def iter_projection_rows(year, players, position=None, max_workers=5):
+    """
+    Rest-of-season projections, one row per player per future game.
+    Players are projected a batch at a time on a thread pool, in order.
+    """
+    positions = [position] if position else get_fantasy_positions()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch in chunked(players, max_workers * 4):
+            with span("projections"):
+                futures = [submit(executor, calculate_weekly_projections, name, year) for name in batch]
+                results = [f.result() for f in futures]
+            for name, (weeks, _, pos) in zip(batch, results):
+                if not weeks or pos not in positions:
+                    continue
+                for week, opponent, projection in weeks:
+                    yield name, pos, week, opponent, round(projection, 1)
@@ -0,0 +1,163 @@
+"""
+Local, append-only store of nflverse weekly, seasonal and schedule data.
+
+Finished seasons never change, so the first fetch is written to
+HISTORY_DIR as gzipped CSV (readable across pandas versions, and nothing
+to unpickle) and every later load (in any process) is a single local
+read, kept in memory for the life of the worker. A stored file that can't
+be read is logged, fetched again and rewritten. The in-progress season is
+fetched once and shared in memory for HISTORY_CURRENT_TTL seconds.
+Every projection call reads from here instead of downloading a season
+per player.
+"""
+import logging
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+from services.cache import cached
+from services.timing import span
+from tools import get_season, lazy_import
+
+nfl = lazy_import("nfl_data_py")
+pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+CURRENT_TTL = int(os.getenv("HISTORY_CURRENT_TTL", "3600"))
+FOREVER = float("inf")
+
+WEEKLY_COLUMNS = [
+    "player_display_name", "position", "recent_team", "opponent_team",
+    "season", "season_type", "week", "carries", "rushing_yards", "rushing_tds",
+    "receptions", "targets", "receiving_yards", "receiving_tds",
+]
+
+
+def history_dir() -> Path:
+    return Path(os.getenv("HISTORY_DIR", "data/history"))
+
+
+def is_final(year) -> bool:
+    """Seasons before the current one are complete and immutable."""
+    return year < get_season()
+
+
+def _stored_path(kind, year) -> Path:
+    return history_dir() / f"{kind}_{year}.csv.gz"
+
+
+def _load(kind, year, fetch):
+    """
+    Read a finished season from disk, fetching and writing it once if it
+    isn't stored yet. The in-progress season is always fetched.
+    """
+    if not is_final(year):
+        with span("nfl_data"):
+            return fetch()
+
+    path = _stored_path(kind, year)
+    if path.exists():
+        try:
+            with span("history"):
+                return pd.read_csv(path, compression="gzip", low_memory=False)
+        except Exception as e:
+            # Truncated or otherwise unreadable: replace it with a fresh copy
+            logger.error(f"Could not read {path}, fetching {kind} data for {year} again: {e}")
+            path.unlink(missing_ok=True)
+
+    with span("nfl_data"):
+        df = fetch()
+    # Append-only: write to a temp file and move it into place, never
+    # overwriting a season another worker already stored
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    df.to_csv(tmp, index=False, compression="gzip")
+    if path.exists():
+        tmp.unlink()
+    else:
+        os.replace(tmp, path)
+    logger.info(f"Stored {kind} data for {year} in {path}")
+    return df
+
+
+def _fetch_weekly(year):
+    df = nfl.import_weekly_data([year])
+    return df[[c for c in WEEKLY_COLUMNS if c in df.columns]]
+
+
+class WeeklySeason(NamedTuple):
+    """A season's weekly frame and what is derived from it, cached together."""
+    frame: "pd.DataFrame"
+    by_player: dict
+    latest_week: int
+
+
+def _weekly_season(year):
+    frame = _load("weekly", year, lambda: _fetch_weekly(year))
+    played = frame[frame["week"] != 0]  # 0 = offseason
+    by_player = {name: rows for name, rows in played.groupby("player_display_name", sort=False)}
+    if "season_type" in played.columns:
+        played = played[played["season_type"] == "REG"]
+    latest = int(played["week"].max()) if len(played) else 0
+    return WeeklySeason(frame, by_player, latest)
+
+
+@cached(ttl=FOREVER)
+def _final_weekly(year):
+    return _weekly_season(year)
+
+
+@cached(ttl=CURRENT_TTL)
+def _current_weekly(year):
+    # One entry, so the player index and latest week refresh with the frame
+    return _weekly_season(year)
+
+
+def _weekly(year) -> WeeklySeason:
+    return _final_weekly(year) if is_final(year) else _current_weekly(year)
+
+
+def get_weekly_data(year):
+    """All players' weekly stats for a season (shared, do not mutate)."""
+    return _weekly(year).frame
+
+
+def get_player_weekly(player_name, year):
+    """One player's rows for a season (dict lookup), or None."""
+    return _weekly(year).by_player.get(player_name)
+
+
+def get_latest_week(year) -> int:
+    """Last regular-season week with data."""
+    return _weekly(year).latest_week
+
+
+@cached(ttl=FOREVER)
+def _final_seasonal(year):
+    return _load("seasonal", year, lambda: nfl.import_seasonal_data([year], "REG"))
+
+
+@cached(ttl=CURRENT_TTL)
+def _current_seasonal(year):
+    return _load("seasonal", year, lambda: nfl.import_seasonal_data([year], "REG"))
+
+
+def get_seasonal_data(year):
+    """Regular-season totals per player for a season (shared, do not mutate)."""
+    return _final_seasonal(year) if is_final(year) else _current_seasonal(year)
+
+
+@cached(ttl=FOREVER)
+def _final_schedules(year):
+    return _load("schedules", year, lambda: nfl.import_schedules([year]))
+
+
+@cached(ttl=CURRENT_TTL)
+def _current_schedules(year):
+    return _load("schedules", year, lambda: nfl.import_schedules([year]))
+
+
+def get_schedules(year):
+    """Season schedule (shared, do not mutate)."""
+    return _final_schedules(year) if is_final(year) else _current_schedules(year)
@@ -1,61 +1,226 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+import time
+
+_import_start = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Literal
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from espn_client import get_league, get_standings, get_scoreboard, get_free_agents
+from espn_client import (
+    LeagueKey, configured_leagues, default_league, resolve_league,
+    get_league_info, get_standings, get_scoreboard, get_free_agents, get_teams,
+    get_simulation_inputs,
+)
 from csv_loader import StatsLoader
+from exports import PROJECTION_COLUMNS, WEEKLY_COLUMNS, iter_projection_rows, iter_weekly_rows
+import history
+from nfl_data import get_all_names
+from services.cache import cache_stats
+from services.export import ENCODERS, MEDIA_TYPES
+from services.timing import TimingMiddleware, span, get_histograms
+from services.warmup import BOOT_STATS, get_warmup_config, run_warmup
+from simulator import DEFAULT_SIMS, MAX_SEED, SIM_CHOICES, simulate_league
+from tools import get_season
+
+# Shared across every league: NFL CSV stats don't depend on the league
+stats_loader = StatsLoader(csv_dir="data")
+
+
+def for_each_league(fn):
+    return lambda: [fn(league) for league in configured_leagues()]
+
+
+WARMUP_TASKS = {
+    "league": for_each_league(get_league_info),
+    "standings": for_each_league(get_standings),
+    "scoreboard": for_each_league(get_scoreboard),
+    "csv": lambda: stats_loader.preload(),
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Uvicorn only reports the worker ready once this returns
+    names, timeout = get_warmup_config()
+    await asyncio.to_thread(run_warmup, WARMUP_TASKS, names, timeout)
+    yield
 
-app = FastAPI(title="League Site (FastAPI)")
+
+app = FastAPI(title="League Site (FastAPI)", lifespan=lifespan)
+app.add_middleware(TimingMiddleware)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
-stats_loader = StatsLoader(csv_dir="data")
+
+
+LEAGUE_PREFIX = "/leagues/{league_id}/{year}"
+
+
+def league_key(league_id: int | None = None, year: int | None = None) -> LeagueKey:
+    """Resolve the league from the /leagues/{league_id}/{year} prefix (or
+    ?league_id=&year= on the plain routes), defaulting to ESPN_LEAGUE_ID."""
+    league = resolve_league(league_id, year)
+    if league is None:
+        detail = f"League {league_id or default_league().league_id} is not configured"
+        if year is not None:
+            detail += f" for {year}"
+        raise HTTPException(status_code=404, detail=detail)
+    return league
+
+
+def league_base(league: LeagueKey) -> str:
+    """URL prefix for links within the same league."""
+    if league == default_league():
+        return ""
+    return f"/leagues/{league.league_id}/{league.year}"
+
+
+def render(template_name: str, context: dict):
+    with span("template"):
+        return templates.TemplateResponse(template_name, context)
 
 
 @app.get("/", response_class=HTMLResponse)
-async def home(request: Request):
-    league = get_league()
-    return templates.TemplateResponse(
-        "index.html", {"request": request, "league": league.settings.name}
+@app.get(LEAGUE_PREFIX, response_class=HTMLResponse)
+async def home(request: Request, league: LeagueKey = Depends(league_key)):
+    info = get_league_info(league)
+    return render(
+        "index.html", {"request": request, "league": info.name, "base": league_base(league)}
     )
 
 
 @app.get("/standings", response_class=HTMLResponse)
-async def standings_view(request: Request):
-    rows = get_standings()
-    return templates.TemplateResponse(
-        "standings.html", {"request": request, "rows": rows}
+@app.get(LEAGUE_PREFIX + "/standings", response_class=HTMLResponse)
+async def standings_view(request: Request, league: LeagueKey = Depends(league_key)):
+    rows = get_standings(league)
+    return render(
+        "standings.html", {"request": request, "rows": rows, "base": league_base(league)}
     )
 
 
 @app.get("/matchups", response_class=HTMLResponse)
-async def matchups_view(request: Request):
-    matchups = get_scoreboard()
-    return templates.TemplateResponse(
-        "matchups.html", {"request": request, "matchups": matchups}
+@app.get(LEAGUE_PREFIX + "/matchups", response_class=HTMLResponse)
+async def matchups_view(request: Request, league: LeagueKey = Depends(league_key)):
+    matchups = get_scoreboard(league)
+    return render(
+        "matchups.html", {"request": request, "matchups": matchups, "base": league_base(league)}
     )
 
 
 @app.get("/teams", response_class=HTMLResponse)
-async def teams_view(request: Request):
-    league = get_league()
-    teams = league.teams
-    return templates.TemplateResponse(
-        "teams.html", {"request": request, "teams": teams}
+@app.get(LEAGUE_PREFIX + "/teams", response_class=HTMLResponse)
+async def teams_view(request: Request, league: LeagueKey = Depends(league_key)):
+    teams = get_teams(league)
+    return render(
+        "teams.html", {"request": request, "teams": teams, "base": league_base(league)}
     )
 
 
 @app.get("/waivers", response_class=HTMLResponse)
-async def waivers_view(request: Request, pos: str | None = None):
-    players = get_free_agents(position=pos)
-    return templates.TemplateResponse(
-        "waivers.html", {"request": request, "players": players, "pos": pos or "ALL"}
+@app.get(LEAGUE_PREFIX + "/waivers", response_class=HTMLResponse)
+async def waivers_view(
+    request: Request, pos: str | None = None, league: LeagueKey = Depends(league_key)
+):
+    players = get_free_agents(league, position=pos)
+    return render(
+        "waivers.html",
+        {"request": request, "players": players, "pos": pos or "ALL", "base": league_base(league)},
+    )
+
+
+@app.get("/odds", response_class=HTMLResponse)
+@app.get(LEAGUE_PREFIX + "/odds", response_class=HTMLResponse)
+def odds_view(
+    request: Request,
+    sims: int = DEFAULT_SIMS,
+    seed: int | None = Query(None, ge=0, le=MAX_SEED),
+    league: LeagueKey = Depends(league_key),
+):
+    # Plain def: FastAPI runs it in the threadpool, so projections and
+    # sampling never block the event loop
+    if sims not in SIM_CHOICES:
+        raise HTTPException(status_code=422, detail=f"sims must be one of {list(SIM_CHOICES)}")
+    inputs = get_simulation_inputs(league)
+    result = simulate_league(league, inputs, n_sims=sims, seed=seed)
+    return render(
+        "odds.html", {"request": request, "result": result, "base": league_base(league)}
     )
 
 
 @app.get("/team/{team_name}", response_class=HTMLResponse)
 async def team_view(request: Request, team_name: str, weeks: int | None = None):
     stats = stats_loader.get_team_stats(team_name, weeks=weeks)
-    return templates.TemplateResponse(
+    return render(
         "team.html", {"request": request, "team_name": team_name, "stats": stats}
     )
+
+
+# Validated from the path before any data is loaded
+ExportFormat = Literal["csv", "parquet"]
+
+
+def export_response(name: str, fmt: ExportFormat, columns, rows):
+    """Stream `rows` as CSV or Parquet; bytes go out as each chunk is encoded."""
+    return StreamingResponse(
+        ENCODERS[fmt](columns, rows),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+# Plain defs: a cold history cache means an nflverse download, which must
+# not run on the event loop
+@app.get("/export/weekly.{fmt}")
+def export_weekly(
+    fmt: ExportFormat, year: int | None = None, position: str | None = None, player: str | None = None
+):
+    """Player x week stats for a season."""
+    year = year or get_season()
+    try:
+        weekly = history.get_weekly_data(year)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"No weekly data for {year}: {e}")
+    rows = iter_weekly_rows(weekly, position=position and position.upper(), player=player)
+    return export_response(f"weekly_{year}", fmt, WEEKLY_COLUMNS, rows)
+
+
+@app.get("/export/projections.{fmt}")
+def export_projections(
+    fmt: ExportFormat,
+    year: int | None = None,
+    position: str | None = None,
+    limit: int | None = Query(None, ge=1),
+):
+    """Rest-of-season z-score projections, one row per player per game."""
+    year = year or get_season()
+    position = position and position.upper()
+    # Filter before limiting, so only the players exported get projected
+    players = get_all_names(year, position=position)
+    if limit is not None:
+        players = players[:limit]
+    rows = iter_projection_rows(year, players, position=position)
+    return export_response(f"projections_{year}", fmt, PROJECTION_COLUMNS, rows)
+
+
+@app.get("/metrics/timing", response_class=JSONResponse)
+async def timing_metrics():
+    """Aggregated per-route span histograms (ms)."""
+    return get_histograms()
+
+
+@app.get("/metrics/cache", response_class=JSONResponse)
+async def cache_metrics():
+    """Entries and estimated bytes per cache namespace (one per league)."""
+    return cache_stats()
+
+
+@app.get("/metrics/boot", response_class=JSONResponse)
+async def boot_metrics():
+    """Module import time and per-task warm-up durations (ms)."""
+    return BOOT_STATS
+
+
+BOOT_STATS["import_ms"] = round((time.perf_counter() - _import_start) * 1000, 1)
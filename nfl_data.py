@@ -1,21 +1,27 @@
-import nfl_data_py as nfl
 from tools import (
     get_season, get_relevant_columns, format_df, get_fantasy_positions,
-    fix_repeating_name_patterns, format_team_name
+    fix_repeating_name_patterns, format_team_name, lazy_import
 )
+from services.cache import cached
+from services.timing import timed
+import history
 import logging
 
+nfl = lazy_import("nfl_data_py")
+
 logger = logging.getLogger(__name__)
-current_season = get_season()
 
 
-def get_teams_schedule(year=current_season):
+def get_teams_schedule(year=None):
     """
     Get NFL schedule for the year.
     Returns dict: {team: [opponent_week1, opponent_week2, ...]}
     """
+    if year is None:
+        year = get_season()
+
     try:
-        schedules = nfl.import_schedules([year])
+        schedules = history.get_schedules(year)
         schedules = schedules[schedules['game_type'] == 'REG']
         team_schedules = {}
         
@@ -32,41 +38,58 @@ def get_teams_schedule(year=current_season):
         return {}
 
 
-def get_all_data(year=current_season):
+@cached(ttl=history.CURRENT_TTL)
+def _formatted_seasonal_data(year):
+    data = history.get_seasonal_data(year)
+    data = format_df(data, get_relevant_columns())
+    data = fix_repeating_name_patterns(data, ["player_display_name", "position"])
+    return data[data['position'].isin(get_fantasy_positions())]
+
+
+def get_all_data(year=None):
     """
     Get seasonal player stats (non-PPR).
     Filters for fantasy-relevant positions and cleans data.
+    Cleaned once per season and shared (do not mutate the result).
     """
+    if year is None:
+        year = get_season()
+
     try:
-        data = nfl.import_seasonal_data([year], "REG")
-        data = format_df(data, get_relevant_columns())
-        data = fix_repeating_name_patterns(data, ["player_display_name", "position"])
-        data = data[data['position'].isin(get_fantasy_positions())]
-        return data
+        return _formatted_seasonal_data(year)
     except Exception as e:
         logger.error(f"Error fetching seasonal data for {year}: {e}")
         return None
 
 
-def get_all_names(year=current_season):
+def get_all_names(year=None, position=None):
     """
     Get all player names sorted by total yards (proxy for production).
-    Falls back to receptions if yards unavailable.
+    Falls back to receptions if yards unavailable. `position` keeps only
+    players at that position.
     """
+    if year is None:
+        year = get_season()
+
     data = get_all_data(year)
     if data is None:
         return []
-    
+    if position:
+        data = data[data['position'] == position]
+
     # Sort by receiving yards as primary metric (fantasy-relevant)
     data = data.sort_values(by='receiving_yards', ascending=False)
     return data['player_display_name'].unique().tolist()
 
 
-def get_player_stats(name, year=current_season):
+def get_player_stats(name, year=None):
     """
     Get seasonal stats for a specific player.
     Returns dict with all non-PPR stats.
     """
+    if year is None:
+        year = get_season()
+
     data = get_all_data(year)
     if data is None:
         return {}
@@ -81,6 +104,7 @@ def get_player_stats(name, year=current_season):
         return {}
 
 
+@timed("nfl_data")
 def get_library_ids():
     """
     Get player ID mappings from nfl_data_py.
@@ -0,0 +1,186 @@
+"""
+Immutable, slotted record types for league payloads.
+
+The cached ESPN helpers return these instead of dicts or espn_api objects,
+so the cache only keeps the handful of fields the templates render.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+import hashlib
+
+GAME_SECONDS = 3 * 3600  # espn_api also treats a game as over 3h after kickoff
+
+
+@dataclass(frozen=True, slots=True)
+class StandingRow:
+    team: str
+    wins: int
+    losses: int
+    points_for: float
+
+
+@dataclass(frozen=True, slots=True)
+class Matchup:
+    home: str
+    home_score: float
+    away: str
+    away_score: float
+
+
+@dataclass(frozen=True, slots=True)
+class TeamSummary:
+    team_id: int
+    team_name: str
+    owner: str
+    wins: int
+    losses: int
+    points_for: float
+
+
+@dataclass(frozen=True, slots=True)
+class FreeAgent:
+    name: str
+    pos: str
+    pro_team: str
+    proj: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class LeagueInfo:
+    name: str
+    current_week: int
+    teams: tuple[TeamSummary, ...]
+
+
+def owner_name(team) -> str:
+    """espn_api exposes owners as a list of member dicts."""
+    owners = getattr(team, "owners", None)
+    if not owners:
+        return getattr(team, "owner", "") or ""
+    names = []
+    for o in owners:
+        if isinstance(o, dict):
+            full = f"{o.get('firstName', '')} {o.get('lastName', '')}".strip()
+            names.append(full or o.get("displayName", ""))
+        else:
+            names.append(str(o))
+    return ", ".join(n for n in names if n)
+
+
+def team_summary(team) -> TeamSummary:
+    return TeamSummary(
+        team_id=team.team_id,
+        team_name=team.team_name,
+        owner=owner_name(team),
+        wins=team.wins,
+        losses=team.losses,
+        points_for=team.points_for,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class RosterPlayer:
+    name: str
+    position: str
+    pro_team: str
+    avg_points: float
+    projected_avg_points: float
+    remaining: float | None = None  # share of this week's game left to play (None = unknown)
+
+
+@dataclass(frozen=True, slots=True)
+class SimTeam:
+    team_id: int
+    team_name: str
+    wins: int
+    losses: int
+    points_for: float  # completed weeks only
+    current_score: float  # live score for the current week
+    schedule: tuple[int, ...]  # opponent team_id per week (own id on a bye)
+    roster: tuple[RosterPlayer, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationInputs:
+    """Everything the simulator reads."""
+    year: int
+    current_week: int
+    reg_season_count: int
+    playoff_team_count: int
+    starters: int
+    teams: tuple[SimTeam, ...]
+
+    @property
+    def fingerprint(self) -> str:
+        """Short digest of every field (scores, rosters, remaining shares)."""
+        return hashlib.blake2b(repr(self).encode(), digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class MatchupOdds:
+    home: str
+    away: str
+    home_mean: float
+    away_mean: float
+    home_win_pct: float
+
+
+@dataclass(frozen=True, slots=True)
+class PlayoffOdds:
+    team: str
+    wins: int
+    losses: int
+    mean_wins: float
+    mean_seed: float
+    playoff_pct: float
+    top_seed_pct: float
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationResult:
+    n_sims: int
+    seed: int | None
+    week: int
+    matchups: tuple[MatchupOdds, ...]
+    teams: tuple[PlayoffOdds, ...]
+
+
+def game_remaining(p, week, now) -> float | None:
+    """
+    Share of a player's game in `week` still to play: 1 before kickoff,
+    0 once it's over or on a bye. None if espn_api gave no pro schedule.
+    """
+    schedule = getattr(p, "schedule", None)
+    if not schedule:
+        return None
+    game = schedule.get(str(week)) or schedule.get(week)
+    if game is None:
+        return 0.0  # bye
+    elapsed = (now - game["date"]).total_seconds() / GAME_SECONDS
+    return round(min(1.0, max(0.0, 1.0 - elapsed)), 2)
+
+
+def roster_player(p, week=None, now=None) -> RosterPlayer:
+    return RosterPlayer(
+        name=p.name,
+        position=p.position,
+        pro_team=p.proTeam,
+        avg_points=float(getattr(p, "avg_points", 0) or 0),
+        projected_avg_points=float(getattr(p, "projected_avg_points", 0) or 0),
+        remaining=game_remaining(p, week, now or datetime.now()) if week else None,
+    )
+
+
+def sim_team(team, week=None, now=None) -> SimTeam:
+    scores = getattr(team, "scores", None) or ()
+    now = now or datetime.now()
+    return SimTeam(
+        team_id=team.team_id,
+        team_name=team.team_name,
+        wins=team.wins,
+        losses=team.losses,
+        points_for=team.points_for,
+        current_score=float(scores[week - 1] or 0) if week and len(scores) >= week else 0.0,
+        schedule=tuple(getattr(opp, "team_id", opp) for opp in team.schedule),
+        roster=tuple(roster_player(p, week, now) for p in team.roster),
+    )
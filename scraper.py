@@ -1,32 +1,31 @@
-import nfl_data_py as nfl
 from tools import (
     get_season, get_fantasy_positions, format_team_name,
-    get_abbreviations, get_fantasy_positions
+    get_abbreviations, get_fantasy_positions, lazy_import
 )
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from defense import STAT_MAPPING, get_defense_table
+from services.timing import submit, timed
+import history
 import logging
-import numpy as np
+
+pd = lazy_import("pandas")
 
 logger = logging.getLogger(__name__)
-current_season = get_season()
 
 
-def get_player_weekly_stats(player_name, year=current_season):
+def get_player_weekly_stats(player_name, year=None):
     """
-    Fetch weekly stats for a player using nfl_data_py.
+    Get weekly stats for a player from the shared history store.
     Filters out BYE weeks automatically.
     Returns DataFrame with columns: Week, carries, rushing_yards, etc.
     """
+    if year is None:
+        year = get_season()
+
     try:
-        weekly_data = nfl.import_weekly_data([year], columns=None)
-        
-        # Filter for player and remove BYE weeks
-        player_data = weekly_data[
-            (weekly_data['player_display_name'] == player_name) &
-            (weekly_data['week'] != 0)  # 0 = offseason
-        ]
+        player_data = history.get_player_weekly(player_name, year)
         
-        if player_data.empty:
+        if player_data is None or player_data.empty:
             logger.warning(f"No weekly data found for {player_name} in {year}")
             return None
         
@@ -41,21 +40,23 @@ def get_player_weekly_stats(player_name, year=current_season):
         return None
 
 
-def get_schedule(player_name, year=current_season):
+def get_schedule(player_name, year=None):
     """
     Get a player's team schedule for the year.
     Returns DataFrame with opponent for each week.
     """
+    if year is None:
+        year = get_season()
+
     try:
-        weekly_data = nfl.import_weekly_data([year])
-        player_data = weekly_data[weekly_data['player_display_name'] == player_name]
+        player_data = history.get_player_weekly(player_name, year)
         
-        if player_data.empty:
+        if player_data is None or player_data.empty:
             logger.warning(f"Schedule not found for {player_name}")
             return None
         
         team = player_data.iloc[0]['recent_team']
-        schedules = nfl.import_schedules([year])
+        schedules = history.get_schedules(year)
         schedules = schedules[schedules['game_type'] == 'REG']
         
         schedule = schedules[
@@ -75,35 +76,23 @@ def get_schedule(player_name, year=current_season):
         return None
 
 
-def get_defense_stats(position, year=current_season):
+def get_defense_stats(position, year=None):
     """
     Get opponent defensive stats aggregated by position allowed.
     Returns DataFrame with teams and points/yards allowed per position.
     """
-    try:
-        def_stats = nfl.import_seasonal_data([year], stat_type='defense')
-        
-        # Map position to relevant defense stat columns
-        stat_mapping = {
-            'RB': ['rushing_yards_allowed', 'rushing_tds_allowed', 'carries_allowed'],
-            'WR': ['receiving_yards_allowed', 'receiving_tds_allowed', 'targets_allowed'],
-            'TE': ['receiving_yards_allowed', 'receiving_tds_allowed', 'targets_allowed']
-        }
-        
-        if position not in stat_mapping:
-            logger.warning(f"No defense stats for position {position}")
-            return None
-        
-        cols = ['team'] + stat_mapping[position]
-        available = [col for col in cols if col in def_stats.columns]
-        return def_stats[available]
-    
-    except Exception as e:
-        logger.error(f"Error fetching defense stats for {position}: {e}")
+    if year is None:
+        year = get_season()
+
+    if position not in STAT_MAPPING:
+        logger.warning(f"No defense stats for position {position}")
         return None
 
+    table = get_defense_table(year)
+    return None if table is None else table.frame(position)
+
 
-def calculate_z_score_projection(player_name, year=current_season):
+def calculate_z_score_projection(player_name, year=None):
     """
     Calculate player projection using z-score method.
     
@@ -114,6 +103,21 @@ def calculate_z_score_projection(player_name, year=current_season):
     
     Returns tuple: (projections_list, completed_games_list, position)
     """
+    weeks, completed_games, position = calculate_weekly_projections(player_name, year)
+    if weeks is None:
+        return None, None, None
+    return [projection for _, _, projection in weeks], completed_games, position
+
+
+@timed("projections")
+def calculate_weekly_projections(player_name, year=None):
+    """
+    Same as calculate_z_score_projection, but each future game is returned
+    as a (week, opponent, projection) tuple.
+    """
+    if year is None:
+        year = get_season()
+
     try:
         from nfl_data import get_player_stats
         
@@ -124,34 +128,33 @@ def calculate_z_score_projection(player_name, year=current_season):
         
         position = player_stats.get('position')
         
-        # Get weekly stats
+        # Get weekly stats; the baseline adds last season (one local read
+        # from the history store) when this season is too short
         weekly = get_player_weekly_stats(player_name, year)
+        baseline = weekly
         if weekly is None or len(weekly) < 4:
-            # Try previous year for context
             prev_weekly = get_player_weekly_stats(player_name, year - 1)
-            if prev_weekly is None or (len(weekly or []) + len(prev_weekly or [])) < 4:
+            frames = [df for df in (weekly, prev_weekly) if df is not None]
+            if sum(len(df) for df in frames) < 4:
                 logger.warning(f"Insufficient data for {player_name}")
                 return None, None, None
-            weekly = np.concat([weekly, prev_weekly]) if weekly is not None else prev_weekly
+            baseline = pd.concat(frames, ignore_index=True)
         
         # Calculate player stats
         relevant_col = 'receiving_yards' if position in ['WR', 'TE'] else 'rushing_yards'
-        player_mean = weekly[relevant_col].mean()
-        player_std = weekly[relevant_col].std()
+        player_mean = baseline[relevant_col].mean()
+        player_std = baseline[relevant_col].std()
         
         if player_std == 0:
             player_std = 1  # Avoid division by zero
         
-        # Get defense stats
-        def_stats = get_defense_stats(position, year)
-        if def_stats is None:
+        # Get defense strength (z-scores are precomputed per team)
+        if position not in STAT_MAPPING:
             return None, None, None
-        
-        defense_mean = def_stats[relevant_col + '_allowed'].mean()
-        defense_std = def_stats[relevant_col + '_allowed'].std()
-        
-        if defense_std == 0:
-            defense_std = 1
+        def_table = get_defense_table(year)
+        if def_table is None:
+            return None, None, None
+        allowed_stat = relevant_col + '_allowed'
         
         # Get schedule
         schedule = get_schedule(player_name, year)
@@ -170,14 +173,12 @@ def calculate_z_score_projection(player_name, year=current_season):
                     completed_games.append(float(week_data[relevant_col].iloc[0]))
             else:
                 # Future game
-                opponent = row['opponent']
-                opp_stats = def_stats[def_stats['team'] == opponent]
+                z_score = def_table.z_score(row['opponent'], position, allowed_stat)
                 
-                if not opp_stats.empty:
-                    opp_allowed = float(opp_stats[relevant_col + '_allowed'].iloc[0])
-                    z_score = (opp_allowed - defense_mean) / defense_std
+                if z_score is not None:
                     projection = player_mean + z_score * player_std
-                    projections.append(max(0, projection))  # No negative projections
+                    # No negative projections
+                    projections.append((int(row['week']), row['opponent'], max(0, projection)))
         
         return projections, completed_games, position
     
@@ -186,7 +187,8 @@ def calculate_z_score_projection(player_name, year=current_season):
         return None, None, None
 
 
-def get_mass_projections(players=None, year=current_season, max_workers=5):
+@timed("projections")
+def get_mass_projections(players=None, year=None, max_workers=5):
     """
     Calculate projections for multiple players using thread pool.
     
@@ -197,6 +199,9 @@ def get_mass_projections(players=None, year=current_season, max_workers=5):
     
     Returns list of [player_name, position, avg_projection]
     """
+    if year is None:
+        year = get_season()
+
     if players is None:
         from nfl_data import get_all_names
         players = get_all_names(year)[:50]
@@ -205,7 +210,7 @@ def get_mass_projections(players=None, year=current_season, max_workers=5):
     
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {
-            executor.submit(calculate_z_score_projection, player, year): player
+            submit(executor, calculate_z_score_projection, player, year): player
             for player in players
         }
         
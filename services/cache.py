@@ -1,21 +1,175 @@
+import inspect
+import os
+import sys
+import threading
 import time
+from collections import OrderedDict
 from functools import wraps
+from services.timing import record_cache
 
+# Per-league namespaces: memory budget each, and how many leagues to keep
+LEAGUE_CACHE_BUDGET = int(os.getenv("LEAGUE_CACHE_BUDGET_KB", "2048")) * 1024
+MAX_LEAGUE_NAMESPACES = int(os.getenv("MAX_CACHED_LEAGUES", "64"))
 
-def cached(ttl: int = 300):
-    store = {}
+GLOBAL = "global"
+PURGE_INTERVAL = 60  # seconds between sweeps for expired entries
+
+
+def estimate_size(value, _seen=None) -> int:
+    """Rough deep size in bytes of cached values (records, tuples, dicts)."""
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return size
+    if isinstance(value, dict):
+        return size + sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(v, _seen) for v in value)
+    for slot in getattr(type(value), "__slots__", ()):
+        size += estimate_size(getattr(value, slot, None), _seen)
+    if hasattr(value, "__dict__"):
+        size += estimate_size(vars(value), _seen)
+    return size
+
+
+class CacheNamespace:
+    """
+    LRU store for one namespace (a league, or "global" for shared data).
+    When `budget` bytes is set, least recently used entries are evicted
+    to stay under it. Entries stored with a ttl are also swept out once
+    expired, so keys that are never read again don't linger.
+    """
+
+    def __init__(self, name, budget=None):
+        self.name = name
+        self.budget = budget
+        self.entries = OrderedDict()  # {key: (value, ts, size, ttl)}
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.purged_at = time.time()
+
+    def get(self, key, ttl):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or time.time() - entry[1] >= ttl:
+                return None
+            self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, ttl=None):
+        size = estimate_size(key) + estimate_size(value) if self.budget else 0
+        now = time.time()
+        with self.lock:
+            if now - self.purged_at >= PURGE_INTERVAL:
+                self._purge_expired(now)
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            self.entries[key] = (value, now, size, ttl)
+            self.bytes += size
+            while self.budget and self.bytes > self.budget and len(self.entries) > 1:
+                _, (_, _, evicted, _) = self.entries.popitem(last=False)
+                self.bytes -= evicted
+
+    def _purge_expired(self, now):
+        expired = [
+            k for k, (_, ts, _, ttl) in self.entries.items() if ttl is not None and now - ts >= ttl
+        ]
+        for key in expired:
+            self.bytes -= self.entries.pop(key)[2]
+        self.purged_at = now
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        return {"entries": len(self.entries), "bytes": self.bytes, "budget": self.budget}
+
+
+_namespaces = OrderedDict({GLOBAL: CacheNamespace(GLOBAL)})
+_namespaces_lock = threading.Lock()
+
+
+def get_namespace(name) -> CacheNamespace:
+    with _namespaces_lock:
+        ns = _namespaces.get(name)
+        if ns is None:
+            ns = _namespaces[name] = CacheNamespace(name, budget=LEAGUE_CACHE_BUDGET)
+            # Drop the least recently used league entirely when over the cap
+            leagues = [n for n in _namespaces if n != GLOBAL]
+            if len(leagues) > MAX_LEAGUE_NAMESPACES:
+                _namespaces.pop(leagues[0])
+        else:
+            _namespaces.move_to_end(name)
+        return ns
+
+
+def clear_namespace(name):
+    with _namespaces_lock:
+        ns = _namespaces.get(name)
+    if ns is not None:
+        ns.clear()
+
+
+def cache_stats():
+    with _namespaces_lock:
+        items = list(_namespaces.items())
+    return {str(name): ns.stats() for name, ns in items}
+
+
+def cached(ttl: int = 300, per_league: bool = False, key=None):
+    """
+    TTL cache decorator. With per_league=True the first argument (a
+    LeagueKey, positional or by keyword) selects the namespace, so each league gets its own store
+    and memory budget; otherwise entries live in the shared "global" store.
+    Keys start with the function's module and qualified name, so same-named
+    functions in different modules never share entries. `key`, if given, is
+    called with the same arguments and returns what identifies the call, for
+    arguments too large to keep in the key themselves.
+    """
+    locks = {}
+    locks_guard = threading.Lock()
 
     def decorator(fn):
+        league_param = next(iter(inspect.signature(fn).parameters), None)
+        name = (fn.__module__, fn.__qualname__)
+
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            key = (fn.__name__, args, tuple(sorted(kwargs.items())))
-            now = time.time()
-            if key in store:
-                value, ts = store[key]
-                if now - ts < ttl:
-                    return value
-            value = fn(*args, **kwargs)
-            store[key] = (value, now)
+            if per_league and not args:
+                # f(league=...) shares entries with f(league)
+                args = (kwargs.pop(league_param),)
+            ns = get_namespace(args[0]) if per_league else _namespaces[GLOBAL]
+            if key is None:
+                cache_key = (name, args, tuple(sorted(kwargs.items())))
+            else:
+                cache_key = (name, key(*args, **kwargs))
+            entry = ns.get(cache_key, ttl)
+            if entry is not None:
+                record_cache(hit=True)
+                return entry[0]
+            # One caller refreshes a key at a time; concurrent callers
+            # (e.g. parallel warm-up tasks) wait for and reuse its value
+            with locks_guard:
+                lock = locks.setdefault(cache_key, threading.Lock())
+            with lock:
+                entry = ns.get(cache_key, ttl)
+                if entry is not None:
+                    record_cache(hit=True)
+                    return entry[0]
+                record_cache(hit=False)
+                try:
+                    value = fn(*args, **kwargs)
+                    ns.set(cache_key, value, ttl)
+                finally:
+                    with locks_guard:
+                        locks.pop(cache_key, None)
             return value
 
         return wrapper
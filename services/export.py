@@ -0,0 +1,84 @@
+"""
+Chunked CSV and Parquet encoders for streaming exports.
+
+Both take column specs and a row iterator and yield bytes a chunk at a
+time, so a response starts immediately and never holds more than
+`chunk_rows` rows.
+"""
+import csv
+import io
+import os
+from itertools import islice
+
+CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "1000"))
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def stream_csv(columns, rows, chunk_rows=CHUNK_ROWS):
+    """Yield the header, then `chunk_rows` rows at a time, as UTF-8 CSV."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in columns])
+    for chunk in chunked(rows, chunk_rows):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()  # header only: no rows
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b"".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def stream_parquet(columns, rows, chunk_rows=CHUNK_ROWS):
+    """Yield a Parquet file with one row group per `chunk_rows` rows."""
+    import pyarrow as pa  # deferred: only exports need it
+    import pyarrow.parquet as pq
+
+    types = {"str": pa.string(), "int": pa.int64(), "float": pa.float64()}
+    schema = pa.schema([(name, types[kind]) for name, kind in columns])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in chunked(rows, chunk_rows):
+            arrays = [
+                pa.array(values, type=field.type)
+                for values, field in zip(zip(*chunk), schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()  # footer
+
+
+ENCODERS = {"csv": stream_csv, "parquet": stream_parquet}
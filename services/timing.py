@@ -0,0 +1,220 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from functools import wraps
+
+ENABLED = os.getenv("TIMING_ENABLED", "1").lower() not in ("0", "false", "no")
+
+# Histogram bucket upper bounds in ms (last bucket is overflow)
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_current = ContextVar("request_timing", default=None)
+_parent = ContextVar("timing_parent", default=None)  # innermost open span
+_lock = threading.Lock()
+_histograms = {}  # {(route, span): {"count", "sum_ms", "buckets"}}
+
+
+class RequestTiming:
+    """
+    Per-request breakdown: self time in ms per span name plus cache
+    hit/miss counts. Pool workers running in the request's context add to
+    it concurrently, hence the lock.
+    """
+
+    __slots__ = ("spans", "cache_hits", "cache_misses", "lock")
+
+    def __init__(self):
+        self.spans = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.lock = threading.Lock()
+
+    def add(self, name, ms):
+        with self.lock:
+            self.spans[name] = self.spans.get(name, 0.0) + ms
+
+    def count_cache(self, hit):
+        with self.lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+
+def _observe(route, name, ms):
+    with _lock:
+        h = _histograms.get((route, name))
+        if h is None:
+            h = _histograms[(route, name)] = {
+                "count": 0, "sum_ms": 0.0, "buckets": [0] * (len(BUCKETS_MS) + 1)
+            }
+        h["count"] += 1
+        h["sum_ms"] += ms
+        h["buckets"][bisect_left(BUCKETS_MS, ms)] += 1
+
+
+class _Frame:
+    """An open span; nested spans hand their breakdown to it when they close."""
+
+    __slots__ = ("children",)
+
+    def __init__(self):
+        # (elapsed ms, {name: ms}) per closed child; list.append is atomic,
+        # so pool workers running in the caller's context can share a frame
+        self.children = []
+
+
+def _breakdown(name, elapsed, children):
+    """
+    Split a span's wall time between itself and its nested spans. Children
+    that ran in parallel pool workers can add up to more than the span's
+    wall time; they are scaled down to fit, so the parts always sum to it.
+    """
+    child_ms = sum(ms for ms, _ in children)
+    scale = min(1.0, elapsed / child_ms) if child_ms else 1.0
+    parts = {name: max(0.0, elapsed - child_ms)}
+    for _, sub in children:
+        for n, ms in sub.items():
+            parts[n] = parts.get(n, 0.0) + ms * scale
+    return parts
+
+
+@contextmanager
+def span(name):
+    """
+    Time a block and add it to the current request's breakdown as self
+    time: nested spans are counted under their own names, not twice.
+    Outside a request the durations go to the "background" histogram.
+    """
+    if not ENABLED:
+        yield
+        return
+    frame = _Frame()
+    token = _parent.set(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        _parent.reset(token)
+        parts = _breakdown(name, elapsed, frame.children)
+        parent = _parent.get()
+        timing = _current.get()
+        if parent is not None:
+            parent.children.append((elapsed, parts))
+        elif timing is not None:
+            for n, ms in parts.items():
+                timing.add(n, ms)
+        else:
+            for n, ms in parts.items():
+                _observe("background", n, ms)
+
+
+def timed(name):
+    """Decorator form of span()."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def submit(executor, fn, *args, **kwargs):
+    """
+    executor.submit() that runs `fn` in a copy of the caller's context, so
+    spans in pool workers count towards the caller's request and span
+    instead of the "background" series.
+    """
+    return executor.submit(copy_context().run, fn, *args, **kwargs)
+
+
+def record_cache(hit):
+    timing = _current.get()
+    if timing is not None:
+        timing.count_cache(hit)
+
+
+def server_timing_header(timing, total_ms):
+    parts = [f"{name};dur={ms:.1f}" for name, ms in timing.spans.items()]
+    if timing.cache_hits or timing.cache_misses:
+        parts.append(f'cache;desc="{timing.cache_hits} hit, {timing.cache_misses} miss"')
+    parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
+
+
+class TimingMiddleware:
+    """
+    ASGI middleware that collects spans for each HTTP request, adds a
+    Server-Timing header and feeds the per-route histograms.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not ENABLED or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - start) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing_header(timing, total_ms).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            total_ms = (time.perf_counter() - start) * 1000
+            # Label by route template so /team/{team_name} is one series
+            route = getattr(scope.get("route"), "path", None) or "other"
+            for name, ms in timing.spans.items():
+                _observe(route, name, ms)
+            _observe(route, "total", total_ms)
+
+
+def _percentile(buckets, count, pct):
+    """Upper bound of the bucket holding the given percentile (None = overflow)."""
+    target = count * pct / 100
+    seen = 0
+    for i, n in enumerate(buckets):
+        seen += n
+        if seen >= target:
+            return BUCKETS_MS[i] if i < len(BUCKETS_MS) else None
+    return None
+
+
+def get_histograms():
+    """Snapshot of the aggregated timings grouped by route then span."""
+    with _lock:
+        items = [(key, dict(h, buckets=list(h["buckets"]))) for key, h in _histograms.items()]
+
+    labels = [f"le_{b}ms" for b in BUCKETS_MS] + ["overflow"]
+    out = {}
+    for (route, name), h in sorted(items):
+        out.setdefault(route, {})[name] = {
+            "count": h["count"],
+            "mean_ms": round(h["sum_ms"] / h["count"], 3),
+            "p50_ms": _percentile(h["buckets"], h["count"], 50),
+            "p95_ms": _percentile(h["buckets"], h["count"], 95),
+            "p99_ms": _percentile(h["buckets"], h["count"], 99),
+            "buckets": dict(zip(labels, h["buckets"])),
+        }
+    return out
+
+
+def reset_histograms():
+    with _lock:
+        _histograms.clear()
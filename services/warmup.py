@@ -0,0 +1,68 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TASKS = "league,standings,scoreboard,csv"
+
+# Filled in by main.py and run_warmup(); served at /metrics/boot
+BOOT_STATS = {"import_ms": None, "warmup_ms": None, "tasks": {}}
+
+
+def get_warmup_config():
+    """
+    WARMUP_TASKS: comma-separated task names, or "none" to skip warm-up.
+    WARMUP_TIMEOUT: seconds to wait before reporting ready regardless.
+    """
+    raw = os.getenv("WARMUP_TASKS", DEFAULT_TASKS).strip().lower()
+    names = [] if raw in ("", "none", "0") else [n.strip() for n in raw.split(",") if n.strip()]
+    timeout = float(os.getenv("WARMUP_TIMEOUT", "30"))
+    return names, timeout
+
+
+def run_warmup(tasks, names, timeout=30.0):
+    """
+    Run the named warm-up tasks in parallel and record how long each took.
+    Failures and timeouts are logged, never raised: a cold cache is better
+    than a worker that never becomes ready.
+
+    Args:
+        tasks: {name: zero-argument callable}
+        names: Task names to run, in any order
+        timeout: Seconds to wait for all tasks
+    """
+    unknown = [n for n in names if n not in tasks]
+    if unknown:
+        logger.warning(f"Unknown warm-up tasks ignored: {unknown}")
+    names = [n for n in names if n in tasks]
+    if not names:
+        BOOT_STATS["warmup_ms"] = 0.0
+        return BOOT_STATS
+
+    def timed_task(name):
+        start = time.perf_counter()
+        try:
+            tasks[name]()
+            ok, error = True, None
+        except Exception as e:
+            logger.error(f"Warm-up task {name} failed: {e}")
+            ok, error = False, str(e)
+        BOOT_STATS["tasks"][name] = {
+            "ms": round((time.perf_counter() - start) * 1000, 1), "ok": ok, "error": error
+        }
+
+    start = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="warmup")
+    futures = {executor.submit(timed_task, name): name for name in names}
+    _, pending = wait(futures, timeout=timeout)
+    executor.shutdown(wait=False)
+    for future in pending:
+        name = futures[future]
+        logger.warning(f"Warm-up task {name} still running after {timeout}s")
+        BOOT_STATS["tasks"][name] = {"ms": None, "ok": False, "error": "timeout"}
+
+    BOOT_STATS["warmup_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    logger.info(f"Warm-up finished in {BOOT_STATS['warmup_ms']}ms: {BOOT_STATS['tasks']}")
+    return BOOT_STATS
@@ -0,0 +1,249 @@
+"""
+Monte Carlo matchup and playoff-odds simulator.
+
+Each team's weekly score is modelled as the sum of its top `starters`
+player distributions. Player means start from ESPN's projected average and
+are scaled by the z-score projection engine's opponent adjustment for the
+rest of the season; the spread comes from the player's own game-to-game
+variation. Whole seasons are then sampled at once as
+(simulations x teams x remaining weeks) arrays.
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import os
+
+from records import MatchupOdds, PlayoffOdds, SimulationResult
+from scraper import calculate_z_score_projection
+from services.cache import cached
+from services.timing import submit, timed
+from tools import get_fantasy_positions, lazy_import
+
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIMS = int(os.getenv("SIM_DEFAULT_SIMS", "20000"))
+MAX_SIMS = int(os.getenv("SIM_MAX_SIMS", "200000"))
+# The only run sizes and seeds /odds accepts, so each league caches a handful of results
+SIM_CHOICES = tuple(sorted({5000, DEFAULT_SIMS, MAX_SIMS}))
+MAX_SEED = 9
+SIM_WORKERS = int(os.getenv("SIM_WORKERS", "1"))
+USE_PROJECTIONS = os.getenv("SIM_USE_PROJECTIONS", "1").lower() not in ("0", "false", "no")
+
+CHUNK_SIMS = 5000  # sims per chunk; bounds memory and fixes the per-chunk seeds
+DEFAULT_CV = 0.45  # weekly std / mean when a player has no history
+CV_RANGE = (0.2, 1.0)
+
+
+@cached(ttl=86400)  # shared across leagues; the engine only reads NFL data
+def get_player_adjustment(player_name, year):
+    """
+    Opponent-strength factor and coefficient of variation for a player from
+    the z-score projection engine, or None if the engine can't project them.
+    """
+    projections, completed, _ = calculate_z_score_projection(player_name, year)
+    if not projections or not completed:
+        return None
+    completed = np.asarray(completed, dtype=float)
+    base = completed.mean()
+    if base <= 0:
+        return None
+    factor = float(np.mean(projections) / base)
+    cv = float(completed.std(ddof=1) / base) if len(completed) > 1 else DEFAULT_CV
+    return factor, float(np.clip(cv, *CV_RANGE))
+
+
+@timed("projections")
+def get_player_adjustments(inputs, max_workers=5):
+    """Run the projection engine for every rostered RB/WR/TE (thread pool)."""
+    if not USE_PROJECTIONS:
+        return {}
+    positions = get_fantasy_positions()
+    names = sorted({
+        p.name for t in inputs.teams for p in t.roster if p.position in positions
+    })
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [submit(executor, get_player_adjustment, n, inputs.year) for n in names]
+        adjustments = (f.result() for f in futures)
+        return {n: a for n, a in zip(names, adjustments) if a is not None}
+
+
+def team_distributions(inputs, adjustments):
+    """
+    Weekly mean, std and score floor per team, shape (teams, remaining weeks).
+    Starters are each team's top `inputs.starters` players by mean.
+
+    The current week starts from each team's live score and only samples the
+    share of its starters' games still to be played. When espn_api has no
+    kickoff times, that share is estimated from how much of the team's
+    projection the live score already covers.
+    """
+    n_teams = len(inputs.teams)
+    max_roster = max((len(t.roster) for t in inputs.teams), default=0)
+    means = np.zeros((n_teams, max_roster))
+    cvs = np.full((n_teams, max_roster), DEFAULT_CV)
+    remaining = np.full((n_teams, max_roster), np.nan)
+    for i, team in enumerate(inputs.teams):
+        for j, p in enumerate(team.roster):
+            base = p.projected_avg_points or p.avg_points
+            factor, cv = adjustments.get(p.name, (1.0, DEFAULT_CV))
+            means[i, j] = max(0.0, base * factor)
+            cvs[i, j] = cv
+            if p.remaining is not None:
+                remaining[i, j] = p.remaining
+
+    order = np.argsort(-means, axis=1)[:, :inputs.starters]
+    start_means = np.take_along_axis(means, order, axis=1)
+    start_vars = (start_means * np.take_along_axis(cvs, order, axis=1)) ** 2
+    team_mean = start_means.sum(axis=1)
+    team_std = np.sqrt(start_vars.sum(axis=1))
+
+    n_weeks = max(0, inputs.reg_season_count - inputs.current_week + 1)
+    mean = np.repeat(team_mean[:, None], n_weeks, axis=1)
+    std = np.repeat(team_std[:, None], n_weeks, axis=1)
+    floor = np.zeros((n_teams, n_weeks))
+    if not n_weeks:
+        return mean, std, floor
+
+    current = np.array([t.current_score for t in inputs.teams], dtype=float)
+    start_left = np.take_along_axis(remaining, order, axis=1)
+    known = ~np.isnan(start_left).all(axis=1)
+    estimate = np.clip(1.0 - np.divide(current, team_mean, out=np.zeros(n_teams), where=team_mean > 0), 0.0, 1.0)
+    start_left = np.where(known[:, None], np.nan_to_num(start_left, nan=1.0), estimate[:, None])
+    # Points still to come scale the mean, and the variance, by the share left
+    mean[:, 0] = current + (start_means * start_left).sum(axis=1)
+    std[:, 0] = np.sqrt((start_vars * start_left).sum(axis=1))
+    floor[:, 0] = current
+    return mean, std, floor
+
+
+def remaining_opponents(inputs):
+    """Opponent index per team per remaining week, shape (teams, weeks)."""
+    index = {t.team_id: i for i, t in enumerate(inputs.teams)}
+    weeks = range(inputs.current_week - 1, inputs.reg_season_count)
+    opp = np.empty((len(inputs.teams), len(weeks)), dtype=np.intp)
+    for i, team in enumerate(inputs.teams):
+        for w, week in enumerate(weeks):
+            opp_id = team.schedule[week] if week < len(team.schedule) else team.team_id
+            opp[i, w] = index.get(opp_id, i)
+    return opp
+
+
+def _simulate_chunk(args):
+    """
+    Sample `n` seasons and return summed outcomes so chunks can be combined
+    without keeping per-simulation arrays around.
+    """
+    n, seed, mean, std, floor, opp, base_wins, base_pf, playoff_teams, matchups = args
+    rng = np.random.default_rng(seed)
+    n_teams, n_weeks = mean.shape
+
+    scores = np.maximum(rng.standard_normal((n, n_teams, n_weeks)) * std + mean, floor)
+    opp_scores = scores[:, opp, np.arange(n_weeks)]
+    has_game = opp != np.arange(n_teams)[:, None]
+    wins = base_wins + ((scores > opp_scores) & has_game).sum(axis=2)
+    points = base_pf + scores.sum(axis=2)
+
+    # Seed by wins, then points for
+    order = np.argsort(-(wins * 1e6 + points), axis=1)
+    seeds = np.empty_like(order)
+    np.put_along_axis(seeds, order, np.arange(n_teams)[None, :], axis=1)
+
+    if n_weeks and len(matchups):
+        home, away = matchups[:, 0], matchups[:, 1]
+        home_wins = (scores[:, home, 0] > scores[:, away, 0]).sum(axis=0)
+    else:
+        home_wins = np.zeros(len(matchups))
+
+    return {
+        "wins": wins.sum(axis=0),
+        "seeds": seeds.sum(axis=0),
+        "playoffs": (seeds < playoff_teams).sum(axis=0),
+        "top_seed": (seeds == 0).sum(axis=0),
+        "home_wins": home_wins,
+    }
+
+
+@timed("simulate")
+def run_simulation(inputs, n_sims=DEFAULT_SIMS, seed=None, workers=SIM_WORKERS):
+    """
+    Simulate the rest of the regular season `n_sims` times.
+
+    Sims are split into fixed-size chunks with seeds spawned from `seed`, so
+    a given seed gives the same result however many workers run them.
+    """
+    adjustments = get_player_adjustments(inputs)
+    mean, std, floor = team_distributions(inputs, adjustments)
+    opp = remaining_opponents(inputs)
+    teams = inputs.teams
+    base_wins = np.array([t.wins for t in teams])
+    base_pf = np.array([t.points_for for t in teams], dtype=float)
+    playoff_teams = inputs.playoff_team_count
+
+    # Current-week pairs, each listed once
+    matchups = np.array(
+        [(i, j) for i, j in enumerate(opp[:, 0]) if i < j] if opp.shape[1] else [],
+        dtype=np.intp,
+    ).reshape(-1, 2)
+
+    sizes = [CHUNK_SIMS] * (n_sims // CHUNK_SIMS)
+    if n_sims % CHUNK_SIMS:
+        sizes.append(n_sims % CHUNK_SIMS)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [
+        (size, s, mean, std, floor, opp, base_wins, base_pf, playoff_teams, matchups)
+        for size, s in zip(sizes, seeds)
+    ]
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_simulate_chunk, jobs))
+    else:
+        chunks = [_simulate_chunk(job) for job in jobs]
+
+    totals = {k: sum(c[k] for c in chunks) for k in chunks[0]}
+    to_pct = 100.0 / n_sims
+
+    matchup_odds = tuple(
+        MatchupOdds(
+            home=teams[h].team_name,
+            away=teams[a].team_name,
+            home_mean=round(float(mean[h, 0]), 1),
+            away_mean=round(float(mean[a, 0]), 1),
+            home_win_pct=round(float(totals["home_wins"][k]) * to_pct, 1),
+        )
+        for k, (h, a) in enumerate(matchups)
+    )
+    team_odds = tuple(sorted(
+        (
+            PlayoffOdds(
+                team=t.team_name,
+                wins=t.wins,
+                losses=t.losses,
+                mean_wins=round(float(totals["wins"][i]) / n_sims, 2),
+                mean_seed=round(float(totals["seeds"][i]) / n_sims + 1, 2),
+                playoff_pct=round(float(totals["playoffs"][i]) * to_pct, 1),
+                top_seed_pct=round(float(totals["top_seed"][i]) * to_pct, 1),
+            )
+            for i, t in enumerate(teams)
+        ),
+        key=lambda o: (-o.playoff_pct, o.mean_seed),
+    ))
+    return SimulationResult(
+        n_sims=n_sims, seed=seed, week=inputs.current_week,
+        matchups=matchup_odds, teams=team_odds,
+    )
+
+
+def _simulation_key(league, inputs, n_sims=DEFAULT_SIMS, seed=None):
+    # The inputs hold every roster; keep only their digest in the key
+    return inputs.fingerprint, n_sims, seed
+
+
+@cached(ttl=3600, per_league=True, key=_simulation_key)
+def simulate_league(league, inputs, n_sims=DEFAULT_SIMS, seed=None):
+    """
+    Cached per league and per `inputs` fingerprint, so any change to
+    records, scores or rosters triggers a fresh run.
+    """
+    return run_simulation(inputs, n_sims=n_sims, seed=seed)
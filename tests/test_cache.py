@@ -0,0 +1,104 @@
+from collections import OrderedDict
+
+import pytest
+
+from services import cache
+from services.cache import GLOBAL, CacheNamespace, cached, estimate_size
+
+
+@pytest.fixture(autouse=True)
+def fresh_namespaces(monkeypatch):
+    monkeypatch.setattr(cache, "_namespaces", OrderedDict({GLOBAL: CacheNamespace(GLOBAL)}))
+
+
+def test_namespace_returns_none_after_ttl(monkeypatch):
+    ns = CacheNamespace("t")
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    ns.set("k", "v")
+    assert ns.get("k", ttl=10)[0] == "v"
+    now[0] += 10
+    assert ns.get("k", ttl=10) is None
+
+
+def test_budget_evicts_least_recently_used():
+    entry_size = estimate_size("a") + estimate_size("x" * 100)
+    ns = CacheNamespace("t", budget=entry_size * 3)
+    for key in "abc":
+        ns.set(key, key * 100)
+    ns.get("a", ttl=60)  # a is now the most recently used
+    ns.set("d", "d" * 100)
+
+    assert list(ns.entries) == ["c", "a", "d"]
+    assert ns.bytes == entry_size * 3
+
+
+def test_budget_keeps_a_single_oversized_entry():
+    ns = CacheNamespace("t", budget=1)
+    ns.set("big", "x" * 1000)
+    assert list(ns.entries) == ["big"]
+
+
+def test_overwrite_replaces_size():
+    ns = CacheNamespace("t", budget=10**6)
+    ns.set("k", "x" * 1000)
+    ns.set("k", "x")
+    assert ns.bytes == estimate_size("k") + estimate_size("x")
+
+
+def test_namespace_cap_drops_least_recently_used_league(monkeypatch):
+    monkeypatch.setattr(cache, "MAX_LEAGUE_NAMESPACES", 2)
+    cache.get_namespace("a")
+    cache.get_namespace("b")
+    cache.get_namespace("a")
+    cache.get_namespace("c")
+
+    assert set(cache.cache_stats()) == {GLOBAL, "a", "c"}
+
+
+def test_per_league_accepts_league_by_keyword():
+    calls = []
+
+    @cached(ttl=60, per_league=True)
+    def lookup(league, position=None):
+        calls.append((league, position))
+        return position
+
+    assert lookup(league="L1", position="WR") == "WR"
+    assert lookup("L1", position="WR") == "WR"
+    assert calls == [("L1", "WR")]
+    assert cache.cache_stats()["L1"]["entries"] == 1
+
+
+def test_same_name_in_different_modules_does_not_collide():
+    def make(module, value):
+        def lookup():
+            return value
+        lookup.__module__ = module
+        return cached(ttl=60)(lookup)
+
+    first, second = make("mod_a", "a"), make("mod_b", "b")
+    assert (first(), second()) == ("a", "b")
+
+
+def test_expired_entries_are_swept(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    ns = CacheNamespace(GLOBAL)
+    ns.set("short", 1, ttl=10)
+    ns.set("forever", 2, ttl=float("inf"))
+    now[0] += cache.PURGE_INTERVAL
+    ns.set("new", 3, ttl=10)
+
+    assert list(ns.entries) == ["forever", "new"]
+
+
+def test_key_function_replaces_arguments_in_key():
+    @cached(ttl=60, per_league=True, key=lambda league, payload: len(payload))
+    def lookup(league, payload):
+        return payload[0]
+
+    assert lookup("L1", ["a"] * 1000) == "a"
+    assert lookup("L1", ["b"] * 1000) == "a"  # same key, cached value
+    ns = cache.get_namespace("L1")
+    assert ns.bytes < estimate_size(["a"] * 1000)
@@ -0,0 +1,81 @@
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+import requests
+import espn_api.requests.espn_requests as espn_requests
+
+import espn_client
+from espn_client import LeagueKey, resolve_league
+
+
+@pytest.fixture
+def leagues(monkeypatch):
+    monkeypatch.setenv("ESPN_LEAGUE_ID", "1")
+    monkeypatch.setenv("ESPN_YEAR", "2025")
+    monkeypatch.setenv("ESPN_LEAGUES", "2:2024,2:2025")
+    espn_client.default_league.cache_clear()
+    espn_client.configured_leagues.cache_clear()
+    yield
+    espn_client.default_league.cache_clear()
+    espn_client.configured_leagues.cache_clear()
+
+
+@pytest.fixture
+def http_pool():
+    espn_client.uninstall_http_pool()
+    yield
+    espn_client.uninstall_http_pool()
+
+
+def test_resolve_league_defaults(leagues):
+    assert resolve_league() == LeagueKey(1, 2025)
+    assert resolve_league(2) == LeagueKey(2, 2024)
+
+
+def test_resolve_league_only_configured_seasons(leagues):
+    assert resolve_league(2, 2025) == LeagueKey(2, 2025)
+    assert resolve_league(2, 2019) is None
+    assert resolve_league(None, 2019) is None
+    assert resolve_league(3) is None
+
+
+def test_espn_requests_calls_module_level_get():
+    # The pool works by swapping this module attribute, so espn_api must
+    # look it up at call time
+    assert espn_requests.requests is requests
+    assert "requests.get(" in inspect.getsource(espn_requests)
+
+
+def test_http_pool_routes_gets_through_session(http_pool):
+    assert espn_client._install_http_pool()
+    with mock.patch.object(requests.Session, "get") as get:
+        espn_requests.requests.get("https://example.invalid", params={})
+    get.assert_called_once()
+
+    espn_client.uninstall_http_pool()
+    assert espn_requests.requests is requests
+
+
+def test_http_pool_skipped_on_unknown_espn_api(http_pool, monkeypatch):
+    monkeypatch.setattr(espn_client, "_espn_api_version", lambda: "0.99.0")
+    assert not espn_client._install_http_pool()
+    assert espn_requests.requests is requests
+
+
+def test_http_pool_concurrent_first_calls_install_once(http_pool, caplog):
+    barrier = threading.Barrier(8)
+
+    def install():
+        barrier.wait()
+        return espn_client._install_http_pool()
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: install(), range(8)))
+
+    assert results == [True] * 8
+    assert espn_client._install_http_pool()
+    assert isinstance(espn_requests.requests, espn_client._PooledRequests)
+    assert "not known to support" not in caplog.text
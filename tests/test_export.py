@@ -0,0 +1,92 @@
+import csv
+import io
+from unittest import mock
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+
+import nfl_data
+from services.export import stream_csv, stream_parquet
+
+COLUMNS = [("player", "str"), ("week", "int"), ("projection", "float")]
+ROWS = [(f"Player {i}", i % 18 + 1, i * 1.5) for i in range(25)]
+
+
+def consumed_rows(rows, seen):
+    for row in rows:
+        seen.append(row)
+        yield row
+
+
+def test_csv_round_trip():
+    data = b"".join(stream_csv(COLUMNS, iter(ROWS), chunk_rows=10)).decode()
+    header, *body = csv.reader(io.StringIO(data))
+    assert header == ["player", "week", "projection"]
+    assert [(p, int(w), float(x)) for p, w, x in body] == ROWS
+
+
+def test_csv_without_rows_is_header_only():
+    assert b"".join(stream_csv(COLUMNS, iter([]))) == b"player,week,projection\r\n"
+
+
+def test_parquet_round_trip():
+    data = b"".join(stream_parquet(COLUMNS, iter(ROWS), chunk_rows=10))
+    table = pq.read_table(io.BytesIO(data))
+
+    assert table.schema.names == ["player", "week", "projection"]
+    assert [tuple(r.values()) for r in table.to_pylist()] == ROWS
+    assert pq.ParquetFile(io.BytesIO(data)).num_row_groups == 3
+
+
+def test_parquet_streams_before_reading_all_rows():
+    seen = []
+    chunks = stream_parquet(COLUMNS, consumed_rows(ROWS, seen), chunk_rows=10)
+    first = next(chunks)
+    assert first.startswith(b"PAR1")
+    assert len(seen) <= 11  # one chunk (plus the lookahead that ends it)
+
+
+def test_parquet_without_rows_is_a_valid_empty_file():
+    data = b"".join(stream_parquet(COLUMNS, iter([])))
+    assert pq.read_table(io.BytesIO(data)).num_rows == 0
+
+
+@pytest.fixture
+def client(monkeypatch):
+    import main
+
+    seasonal = pd.DataFrame({
+        "player_display_name": ["WR1", "RB1", "WR2", "RB2", "RB3"],
+        "position": ["WR", "RB", "WR", "RB", "RB"],
+        "receiving_yards": [900, 500, 800, 300, 100],
+    })
+    monkeypatch.setattr(nfl_data, "get_all_data", lambda year=None: seasonal)
+    monkeypatch.setattr(main.history, "get_weekly_data", mock.Mock(side_effect=AssertionError))
+    projected = []
+
+    def rows(year, players, position=None):
+        projected.extend(players)
+        return iter([])
+
+    monkeypatch.setattr(main, "iter_projection_rows", rows)
+    client = TestClient(main.app)
+    client.projected = projected
+    return client
+
+
+def test_projections_filter_by_position_before_limit(client):
+    assert client.get("/export/projections.csv?position=rb&limit=2").status_code == 200
+    assert client.projected == ["RB1", "RB2"]
+
+
+@pytest.mark.parametrize("url", [
+    "/export/projections.csv?limit=-3",
+    "/export/projections.csv?limit=0",
+    "/export/projections.xlsx",
+    "/export/weekly.xlsx",  # rejected before the season is loaded
+])
+def test_invalid_export_parameters_are_rejected(client, url):
+    assert client.get(url).status_code == 422
+    assert client.projected == []
@@ -0,0 +1,68 @@
+from collections import OrderedDict
+
+import pandas as pd
+import pytest
+
+import history
+from services import cache
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("HISTORY_DIR", str(tmp_path))
+    monkeypatch.setattr(history, "get_season", lambda: 2025)
+    return tmp_path
+
+
+def frame():
+    return pd.DataFrame({"player_display_name": ["A", "B"], "week": [1, 2], "receiving_yards": [10.5, 0.0]})
+
+
+def test_finished_season_is_fetched_once():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return frame()
+
+    history._load("weekly", 2024, fetch)
+    stored = history._load("weekly", 2024, fetch)
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(stored, frame())
+
+
+def test_unreadable_file_is_fetched_again(store):
+    path = store / "weekly_2024.csv.gz"
+    path.write_bytes(b"\x1f\x8b truncated")
+
+    loaded = history._load("weekly", 2024, frame)
+
+    pd.testing.assert_frame_equal(loaded, frame())
+    pd.testing.assert_frame_equal(history._load("weekly", 2024, lambda: None), frame())
+
+
+def test_current_season_is_not_stored(store):
+    history._load("weekly", 2025, frame)
+    assert not list(store.iterdir())
+
+
+def test_current_season_index_and_latest_week_refresh_with_frame(monkeypatch):
+    monkeypatch.setattr(cache, "_namespaces", OrderedDict({cache.GLOBAL: cache.CacheNamespace(cache.GLOBAL)}))
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    weeks = [[1, 2]]
+
+    def fetch(year):
+        df = frame().assign(season_type="REG")
+        return df.assign(week=weeks[0])
+
+    monkeypatch.setattr(history, "_fetch_weekly", fetch)
+    assert history.get_latest_week(2025) == 2
+    assert list(history.get_player_weekly("B", 2025)["week"]) == [2]
+
+    weeks[0] = [1, 3]
+    now[0] += history.CURRENT_TTL
+    assert history.get_latest_week(2025) == 3
+    assert list(history.get_player_weekly("B", 2025)["week"]) == [3]
+    assert list(history.get_weekly_data(2025)["week"]) == [1, 3]
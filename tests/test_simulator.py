@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import simulator
+from services import cache
+from records import RosterPlayer, SimTeam, SimulationInputs, game_remaining
+
+
+@pytest.fixture(autouse=True)
+def espn_projections_only(monkeypatch):
+    monkeypatch.setattr(simulator, "USE_PROJECTIONS", False)
+
+
+def make_inputs(home_score, away_score, remaining):
+    def team(team_id, opp_id, score):
+        roster = tuple(
+            RosterPlayer(f"P{team_id}{i}", "WR", "KC", 10.0, 10.0, remaining) for i in range(3)
+        )
+        return SimTeam(
+            team_id=team_id, team_name=f"T{team_id}", wins=0, losses=0, points_for=0.0,
+            current_score=score, schedule=(opp_id,), roster=roster,
+        )
+
+    return SimulationInputs(
+        year=2025, current_week=1, reg_season_count=1, playoff_team_count=1, starters=3,
+        teams=(team(1, 2, home_score), team(2, 1, away_score)),
+    )
+
+
+def test_finished_week_is_decided_by_live_scores():
+    result = simulator.run_simulation(make_inputs(40.0, 30.0, remaining=0.0), n_sims=1000, seed=1)
+    matchup = result.matchups[0]
+    assert (matchup.home_mean, matchup.away_mean) == (40.0, 30.0)
+    assert matchup.home_win_pct == 100.0
+
+
+def test_only_unplayed_share_is_added_to_live_score():
+    mean, std, floor = simulator.team_distributions(make_inputs(12.0, 0.0, remaining=0.5), {})
+    assert mean[0, 0] == pytest.approx(12.0 + 3 * 10.0 * 0.5)
+    assert floor[0, 0] == 12.0
+    assert std[0, 0] == pytest.approx((3 * 0.5 * (10.0 * simulator.DEFAULT_CV) ** 2) ** 0.5)
+
+
+def test_unknown_kickoffs_estimate_share_from_live_score():
+    mean, _, _ = simulator.team_distributions(make_inputs(15.0, 0.0, remaining=None), {})
+    # 15 of a 30 point projection scored: half of it is still to come
+    assert mean[0, 0] == pytest.approx(15.0 + 15.0)
+    assert mean[1, 0] == pytest.approx(30.0)
+
+
+def test_live_score_is_part_of_the_cache_key():
+    assert make_inputs(10.0, 0.0, None).fingerprint != make_inputs(11.0, 0.0, None).fingerprint
+    assert make_inputs(10.0, 0.0, 0.5).fingerprint != make_inputs(10.0, 0.0, 0.4).fingerprint
+    assert make_inputs(10.0, 0.0, 0.5).fingerprint == make_inputs(10.0, 0.0, 0.5).fingerprint
+
+
+def test_cached_result_does_not_keep_the_inputs(monkeypatch):
+    monkeypatch.setattr(cache, "_namespaces", OrderedDict({cache.GLOBAL: cache.CacheNamespace(cache.GLOBAL)}))
+    inputs = make_inputs(10.0, 0.0, 0.5)
+    result = simulator.simulate_league("L1", inputs, n_sims=1000, seed=1)
+
+    assert simulator.simulate_league("L1", make_inputs(10.0, 0.0, 0.5), n_sims=1000, seed=1) is result
+    (key,) = cache.get_namespace("L1").entries
+    assert cache.estimate_size(key) < cache.estimate_size(inputs) / 4
+
+
+def test_game_remaining():
+    kickoff = datetime(2025, 10, 5, 13, 0)
+    player = SimpleNamespace(schedule={"5": {"team": "BUF", "date": kickoff}})
+    assert game_remaining(player, 5, kickoff - timedelta(hours=1)) == 1.0
+    assert game_remaining(player, 5, kickoff + timedelta(hours=1.5)) == 0.5
+    assert game_remaining(player, 5, kickoff + timedelta(hours=4)) == 0.0
+    assert game_remaining(player, 6, kickoff) == 0.0  # bye
+    assert game_remaining(SimpleNamespace(schedule={}), 5, kickoff) is None
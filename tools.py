@@ -1,5 +1,7 @@
 from datetime import date, datetime, timedelta, timezone
+import importlib
 import logging
+import threading
 
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
@@ -40,6 +42,37 @@ def get_season():
     return current_year if today_est > end_of_week_1 else current_year - 1
 
 
+class LazyModule:
+    """
+    Stand-in for a heavy module (pandas, numpy, nfl_data_py) that is only
+    imported on first attribute access, so worker boot doesn't pay for it.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    """Return a LazyModule for `name`."""
+    return LazyModule(name)
+
+
 def get_abbreviations():
     """Return NFL team abbreviation to full name mapping."""
     return TEAM_ABBREVIATIONS